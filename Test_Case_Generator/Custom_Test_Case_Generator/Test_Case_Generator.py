@@ -1,5 +1,9 @@
+import argparse
 import csv
+import math
+import os
 import random
+import sys
 
 component_ids = [
     "Camera_Sensor", "Image_Processor", "Bitmap_Processor", "Lidar_Sensor",
@@ -52,13 +56,16 @@ def generate_test_case(num_cores, num_components):
 def generate_tasks(budgets, num_tasks):
     """Generates tasks.csv data based on available components."""
     tasks = []
+    schedulers = {}
+    for budget in budgets:
+        schedulers.setdefault(budget["component_id"], budget["scheduler"])  # First entry wins, as before
     priority_counter = 1
     for i in range(1, num_tasks + 1):
         task_name = f"Task_{i}"
         wcet = random.randint(1, 8)
         period = random.randint(10, 50)
         component_id = random.choice(budgets)["component_id"]
-        scheduler = next((budget["scheduler"] for budget in budgets if budget["component_id"] == component_id), None)
+        scheduler = schedulers.get(component_id)
         priority = priority_counter if scheduler == "RM" else ""
         tasks.append({
             "task_name": task_name,
@@ -79,18 +86,181 @@ def write_csv(filename, data, fieldnames):
         writer.writerows(data)
 
 
+def uunifast(n, total_utilization, rng=random):
+    """Yields n utilizations summing to total_utilization (Bini and Buttazzo), one at a time."""
+    remaining = total_utilization
+    for i in range(1, n):
+        next_remaining = remaining * rng.random() ** (1.0 / (n - i))
+        yield remaining - next_remaining
+        remaining = next_remaining
+    if n > 0:
+        yield remaining
+
+
+def component_name(index):
+    """Names components after the predefined list, numbering them once the list is exhausted."""
+    base = component_ids[index % len(component_ids)]
+    cycle = index // len(component_ids)
+    return base if cycle == 0 else f"{base}_{cycle + 1}"
+
+
+def make_period_sampler(mode, min_period, max_period, granularity, hyperperiod, rng=random):
+    """Returns sample(floor) drawing a period of at least floor from the chosen distribution.
+
+    Periods stay within min_period..max_period unless none of the choices there reaches floor; then the smallest
+    longer one is used: the next power of two for harmonic periods, the next divisor or a power-of-two multiple of
+    the hyperperiod for divisors. Harmonic and divisor periods thus keep the hyperperiod bounded, log-uniform ones do not.
+    """
+    if mode == "harmonic":
+        periods = []
+        period = min_period
+        while period <= max_period:
+            periods.append(period)
+            period *= 2
+
+        def harmonic(floor=0):
+            choices = [period for period in periods if period >= floor]
+            if choices:
+                return rng.choice(choices)
+            return min_period * 2 ** math.ceil(math.log2(floor / min_period))
+        return harmonic
+    if mode == "divisors":
+        divisors = [d for d in range(min_period, hyperperiod + 1) if hyperperiod % d == 0]
+        periods = [d for d in divisors if d <= max_period]
+        if not periods:
+            raise ValueError(f"No divisor of {hyperperiod} lies in [{min_period}, {max_period}]")
+
+        def divisor(floor=0):
+            choices = [period for period in periods if period >= floor]
+            if choices:
+                return rng.choice(choices)
+            larger = [d for d in divisors if d >= floor]
+            if larger:
+                return larger[0]
+            return hyperperiod * 2 ** math.ceil(math.log2(floor / hyperperiod))
+        return divisor
+
+    def log_uniform(floor=0):
+        low = max(min_period, floor)
+        period = math.exp(rng.uniform(math.log(low), math.log(max(max_period, low))))
+        period = max(granularity, int(round(period / granularity)) * granularity)
+        return period if period >= floor else math.ceil(floor / granularity) * granularity
+    return log_uniform
+
+
+def generate_streaming(output_dir, num_cores, num_components, num_tasks, core_utilization=0.6, task_load=0.8,
+                       period_mode="divisors", min_period=10, max_period=1000, granularity=10,
+                       hyperperiod=3600, bcet_ratio=None, seed=None):
+    """Writes architecture.csv, budgets.csv and tasks.csv, streaming the tasks row by row."""
+    rng = random.Random(seed)
+    sample_period = make_period_sampler(period_mode, min_period, max_period, granularity, hyperperiod, rng)
+    os.makedirs(output_dir, exist_ok=True)
+
+    cores = [f"Core_{i}" for i in range(1, num_cores + 1)]
+    with open(os.path.join(output_dir, "architecture.csv"), mode="w", newline="") as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(["core_id", "speed_factor", "scheduler"])
+        speeds = []
+        for core_id in cores:
+            speeds.append(round(rng.uniform(0.5, 1.5), 2))
+            writer.writerow([core_id, speeds[-1], rng.choice(["EDF", "RM"])])
+
+    # Components are dealt round-robin to cores and share each core's utilization through UUniFast
+    per_core = [list(range(c, num_components, num_cores)) for c in range(num_cores)]
+    alphas = [0.0] * num_components
+    for members in per_core:
+        for index, share in zip(members, uunifast(len(members), core_utilization, rng)):
+            alphas[index] = share
+
+    schedulers = []
+    with open(os.path.join(output_dir, "budgets.csv"), mode="w", newline="") as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(["component_id", "scheduler", "budget", "period", "core_id", "priority"])
+        for index in range(num_components):
+            scheduler = rng.choice(["EDF", "RM"])
+            schedulers.append(scheduler)
+            period = min_period
+            # Unrounded, so the budgets keep the UUniFast shares exactly whatever the component count
+            budget = alphas[index] * period
+            writer.writerow([component_name(index), scheduler, budget, period, cores[index % num_cores], ""])
+
+    fieldnames = ["task_name", "wcet", "period", "component_id", "priority"]
+    if bcet_ratio is not None:
+        fieldnames.insert(2, "bcet")
+    task_number = 0
+    stretched = 0
+    with open(os.path.join(output_dir, "tasks.csv"), mode="w", newline="") as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(fieldnames)
+        for index in range(num_components):
+            count = num_tasks // num_components + (1 if index < num_tasks % num_components else 0)
+            # The simulator runs every job for whole ticks, adding less than 1/period to each task's load. Periods
+            # of at least count / slack keep that within the budget left over by task_load, and periods of at
+            # least 1/utilization keep every WCET at one tick or more
+            slack = alphas[index] * (1 - task_load)
+            component_floor = count / slack if slack > 0 else 0
+            # On a core slower than 1 the simulator spends wcet * speed ticks on a job, so the load is scaled down
+            # for both the WCETs and those ticks to stay within task_load
+            load = alphas[index] * task_load / max(speeds[index % num_cores], 1.0)
+            for utilization in uunifast(count, load, rng):
+                floor = max(component_floor, 1 / utilization if utilization > 0 else 0)
+                period = sample_period(floor)
+                stretched += period > max_period
+                # Unrounded as well: rounding to a fixed step and flooring it would inflate small utilizations
+                wcet = utilization * period
+                # Rate-monotonic priorities straight from the period keep generation single-pass
+                priority = int(period) if schedulers[index] == "RM" else 0
+                row = [f"Task_{task_number}", wcet, period, component_name(index), priority]
+                if bcet_ratio is not None:
+                    row.insert(2, wcet * bcet_ratio)
+                writer.writerow(row)
+                task_number += 1
+
+    if stretched:
+        print(f"Note: {stretched} of {task_number} tasks got a period above --max-period {max_period} to keep "
+              f"their WCET at one tick or more within their component's budget.", file=sys.stderr)
+    return task_number
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Synthetic test case generator for the hierarchical scheduling tool")
+    parser.add_argument("--cores", type=int, help="Number of cores")
+    parser.add_argument("--components", type=int, help="Number of components (any count, names are reused with a suffix)")
+    parser.add_argument("--tasks", type=int, help="Number of tasks")
+    parser.add_argument("--output-dir", type=str, default=".", help="Directory receiving the three CSV files")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducible cases")
+    parser.add_argument("--utilization", type=float, default=0.6, help="Total component utilization per core")
+    parser.add_argument("--task-load", type=float, default=0.8, help="Fraction of a component's budget used by its tasks")
+    parser.add_argument("--periods", choices=["divisors", "harmonic", "loguniform"], default="divisors", help="Period distribution")
+    parser.add_argument("--min-period", type=int, default=10, help="Smallest task period")
+    parser.add_argument("--max-period", type=int, default=1000, help="Largest task period, exceeded only by tasks that need longer periods to run in whole ticks within their budget")
+    parser.add_argument("--granularity", type=int, default=10, help="Rounding step of log-uniform periods")
+    parser.add_argument("--hyperperiod", type=int, default=3600, help="Hyperperiod whose divisors are used as periods")
+    parser.add_argument("--bcet-ratio", type=float, default=None, help="Also write a bcet column equal to wcet times this ratio")
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
-    num_cores = int(input("Enter the number of cores: "))
-    num_components = int(input("Enter the number of components (up to {}): ".format(len(component_ids))))
-    num_tasks = int(input("Enter the number of tasks: "))
-
-    architectures, budgets = generate_test_case(num_cores, num_components)
-    tasks = generate_tasks(budgets, num_tasks)
-
-    write_csv("architecture.csv", architectures, ["core_id", "speed_factor", "scheduler"])
-    write_csv(
-        "budgets.csv", budgets, ["component_id", "scheduler", "budget", "period", "core_id", "priority"]
-    )
-    write_csv("tasks.csv", tasks, ["task_name", "wcet", "period", "component_id", "priority"])
+    args = parse_args()
+    if args.cores is None or args.components is None or args.tasks is None:
+        num_cores = int(input("Enter the number of cores: "))
+        num_components = int(input("Enter the number of components (up to {}): ".format(len(component_ids))))
+        num_tasks = int(input("Enter the number of tasks: "))
+
+        architectures, budgets = generate_test_case(num_cores, num_components)
+        tasks = generate_tasks(budgets, num_tasks)
+
+        write_csv("architecture.csv", architectures, ["core_id", "speed_factor", "scheduler"])
+        write_csv(
+            "budgets.csv", budgets, ["component_id", "scheduler", "budget", "period", "core_id", "priority"]
+        )
+        write_csv("tasks.csv", tasks, ["task_name", "wcet", "period", "component_id", "priority"])
+    else:
+        generate_streaming(
+            args.output_dir, args.cores, args.components, args.tasks,
+            core_utilization=args.utilization, task_load=args.task_load, period_mode=args.periods,
+            min_period=args.min_period, max_period=args.max_period, granularity=args.granularity,
+            hyperperiod=args.hyperperiod, bcet_ratio=args.bcet_ratio, seed=args.seed,
+        )
 
     print("Test cases generated successfully!")
@@ -0,0 +1,207 @@
+import argparse, contextlib, importlib.util, json, os, platform, sys, tempfile, tracemalloc
+from datetime import datetime
+from time import perf_counter
+
+import main
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+TEST_CASE_DIR = os.path.join(REPO_DIR, "Test_Case_Generator")
+BUNDLED_CASES = [
+    "1-tiny-test-case", "2-small-test-case", "3-medium-test-case",
+    "4-large-test-case", "5-huge-test-case", "6-gigantic-test-case",
+]
+# (cores, components, tasks) of the generated cases, in increasing size
+GENERATED_SIZES = [(2, 8, 100), (4, 32, 1000), (8, 128, 10000)]
+# The generator stretches the periods of tasks with small utilizations so their WCETs stay whole ticks, which puts
+# the hyperperiods of larger generated cases in the millions; they are simulated for this many ticks instead
+GENERATED_MAX_TIME = 100_000
+STAGES = ["load", "find_min_bdr_params", "run_analysis", "run_simulation", "export_solution_csv"]
+
+
+def _load_generator():
+    path = os.path.join(TEST_CASE_DIR, "Custom_Test_Case_Generator", "Test_Case_Generator.py")
+    spec = importlib.util.spec_from_file_location("Test_Case_Generator", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _load(input_dir):
+    return main.load_system_model_from_csv(*main._input_files(input_dir))
+
+
+def _measure(func, repeat, memory=True):
+    """Times func over `repeat` silenced runs (fastest wins); peak memory comes from one extra traced run."""
+    best_seconds, peak_bytes, result = None, None, None
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(repeat):
+            started = perf_counter()
+            result = func()
+            seconds = perf_counter() - started
+            best_seconds = seconds if best_seconds is None else min(best_seconds, seconds)
+        # tracemalloc slows allocation-heavy code down a lot, so it never overlaps the timed runs
+        if memory:
+            tracemalloc.start()
+            func()
+            peak_bytes = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    return best_seconds, peak_bytes, result
+
+
+def _count(func):
+    """Runs func once, silenced, with the PROFILER counters on; returns them."""
+    enabled = main.PROFILER.enabled
+    main.PROFILER.enabled = True
+    main.PROFILER.reset()
+    try:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            func()
+        return dict(main.PROFILER.counters)
+    finally:
+        main.PROFILER.enabled = enabled
+        main.PROFILER.reset()
+
+
+def benchmark_case(input_dir, stages, repeat=1, exact=False, memory=True, max_time=None):
+    results = {}
+    system = _load(input_dir)
+    components = list(system["components"].values())
+    num_tasks = len(system["tasks"])
+
+    if "load" in stages:
+        seconds, peak, _ = _measure(lambda: _load(input_dir), repeat, memory)
+        results["load"] = {"seconds": seconds, "peak_bytes": peak, "tasks_per_second": num_tasks / seconds if seconds else None}
+
+    if "find_min_bdr_params" in stages:
+        # The same task sets run_analysis hands the search: the system columns, or Task objects for the exact search
+        work = [(main._interface_tasks(system, comp, None, exact), comp.scheduling, exact) for comp in components]
+        search = lambda: [main._component_interface(item) for item in work]
+        seconds, peak, _ = _measure(search, repeat, memory)
+        # The search itself counts the dbf points it evaluates, in a separate run kept out of the timing
+        dbf_evaluations = _count(search).get("dbf_evaluations", 0)
+        results["find_min_bdr_params"] = {
+            "seconds": seconds, "peak_bytes": peak, "dbf_evaluations": dbf_evaluations,
+            "dbf_evaluations_per_second": dbf_evaluations / seconds if seconds else None,
+        }
+
+    if "run_analysis" in stages:
+        # run_analysis updates the interfaces in place, so every run starts again from the budgets.csv supply
+        analysed = _load(input_dir)
+
+        def analyze():
+            analysed["arrays"].restore_budget_supply(analysed)
+            return main.run_analysis(analysed, exact=exact)
+
+        seconds, peak, _ = _measure(analyze, repeat, memory)
+        results["run_analysis"] = {"seconds": seconds, "peak_bytes": peak}
+
+    response_times = None
+    if "run_simulation" in stages or "export_solution_csv" in stages:
+        sim_time = int(main.lcm([task.period for task in system["tasks"].values()]))
+        if max_time is not None:
+            sim_time = min(sim_time, max_time)
+        # The simulation only reads the system, so all runs share the one loaded above
+        seconds, peak, (_, response_times) = _measure(lambda: main.run_simulation(system, max_time=sim_time),
+                                                      repeat, memory)
+        if "run_simulation" in stages:
+            ticks = sim_time * len(system["cores"])
+            results["run_simulation"] = {
+                "seconds": seconds, "peak_bytes": peak, "simulated_ticks": ticks,
+                "ticks_per_second": ticks / seconds if seconds else None,
+            }
+
+    if "export_solution_csv" in stages:
+        with tempfile.TemporaryDirectory() as tmp:
+            output_file = os.path.join(tmp, "solution.csv")
+            seconds, peak, _ = _measure(lambda: main.export_solution_csv(system, response_times, filename=output_file), repeat, memory)
+        results["export_solution_csv"] = {"seconds": seconds, "peak_bytes": peak, "rows_per_second": num_tasks / seconds if seconds else None}
+
+    return {
+        "cores": len(system["cores"]), "components": len(components), "tasks": num_tasks,
+        "stages": results,
+    }
+
+
+def run_benchmarks(cases, sizes, stages, repeat=1, exact=False, seed=0, memory=True):
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "exact_interface": exact,
+        "cases": {},
+    }
+    for case in cases:
+        input_dir = case if os.path.isdir(case) else os.path.join(TEST_CASE_DIR, case)
+        print(f"[BENCH] {case}", file=sys.stderr)
+        report["cases"][os.path.basename(os.path.normpath(input_dir))] = benchmark_case(input_dir, stages, repeat, exact, memory)
+
+    if sizes:
+        generator = _load_generator()
+        with tempfile.TemporaryDirectory() as tmp:
+            for cores, components, tasks in sizes:
+                name = f"generated-{cores}c-{components}k-{tasks}t"
+                input_dir = os.path.join(tmp, name)
+                generator.generate_streaming(input_dir, cores, components, tasks, seed=seed)
+                print(f"[BENCH] {name}", file=sys.stderr)
+                report["cases"][name] = benchmark_case(input_dir, stages, repeat, exact, memory, GENERATED_MAX_TIME)
+    return report
+
+
+def compare_reports(report, baseline, threshold):
+    """Prints the time ratio against the baseline per case and stage; returns the regressions."""
+    regressions = []
+    for case, current in report["cases"].items():
+        previous = baseline.get("cases", {}).get(case)
+        if previous is None:
+            continue
+        for stage, metrics in current["stages"].items():
+            before = previous["stages"].get(stage)
+            if not before or not before["seconds"]:
+                continue
+            ratio = metrics["seconds"] / before["seconds"]
+            flag = "REGRESSION" if ratio > threshold else "ok"
+            print(f"{case:<40} {stage:<22} {before['seconds']:>10.4f}s -> {metrics['seconds']:>10.4f}s  x{ratio:.2f}  {flag}")
+            if ratio > threshold:
+                regressions.append((case, stage, ratio))
+    return regressions
+
+
+def parse_size(text):
+    cores, components, tasks = (int(part) for part in text.split("x"))
+    return cores, components, tasks
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Benchmark the analysis and simulation hot paths")
+    parser.add_argument('--cases', nargs='*', default=BUNDLED_CASES, help="Bundled case names or input directories to benchmark")
+    parser.add_argument('--sizes', nargs='*', type=parse_size, default=GENERATED_SIZES, help="Generated cases as CORESxCOMPONENTSxTASKS, e.g. 8x128x10000")
+    parser.add_argument('--stages', nargs='*', choices=STAGES, default=STAGES, help="Stages to time")
+    parser.add_argument('--repeat', type=int, default=1, help="Runs per stage; the fastest is reported")
+    parser.add_argument('--exact-interface', action='store_true', help="Benchmark the exact interface search instead of the alpha grid")
+    parser.add_argument('--no-memory', action='store_true', help="Skip the traced run that measures peak memory")
+    parser.add_argument('--seed', type=int, default=0, help="Seed of the generated cases")
+    parser.add_argument('--output', type=str, default=None, help="Write the JSON report to this file instead of stdout")
+    parser.add_argument('--baseline', type=str, default=None, help="JSON report to compare against")
+    parser.add_argument('--threshold', type=float, default=1.2, help="Slowdown ratio reported as a regression")
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.cases, args.sizes, args.stages, args.repeat, args.exact_interface, args.seed,
+                            memory=not args.no_memory)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"[INFO] Benchmark report saved to: {args.output}", file=sys.stderr)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_reports(report, baseline, args.threshold)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main_cli()
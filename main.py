@@ -1,9 +1,13 @@
-import csv, copy, os, sys, argparse, datetime
-from math import gcd, ceil, floor
+import csv, os, sys, gc, argparse, datetime, heapq, glob, contextlib, json, hashlib, sqlite3, struct, cProfile
+from math import gcd, ceil, floor, frexp
 from functools import reduce
-from collections import defaultdict
+from fractions import Fraction
+from itertools import groupby
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 from datetime import datetime
+from time import perf_counter
 
 class Logger:
     def __init__(self, log_file_path):
@@ -19,7 +23,61 @@ class Logger:
         self.log.flush()
 
 
+class Instrumentation:
+    """Phase timers and counters for --profile; phase() and add() do nothing while disabled."""
+
+    def __init__(self):
+        self.enabled = False
+        self.reset()
+
+    def reset(self):
+        self.phases = defaultdict(float)
+        self.counters = defaultdict(int)
+
+    @contextlib.contextmanager
+    def _timed(self, name):
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] += perf_counter() - started
+
+    def phase(self, name):
+        return self._timed(name) if self.enabled else contextlib.nullcontext()
+
+    def add(self, name, value=1):
+        if self.enabled:
+            self.counters[name] += value
+
+    def merge(self, counters):
+        for name, value in counters.items():
+            self.counters[name] += value
+
+    def to_dict(self):
+        return {"phases": dict(self.phases), "counters": dict(self.counters)}
+
+    def report(self):
+        print("\n--- PROFILE ---")
+        total = sum(seconds for name, seconds in self.phases.items() if "." not in name)
+        for name, seconds in self.phases.items():
+            share = 100 * seconds / total if total else 0.0
+            indent = "    " if "." in name else "  "
+            print(f"{indent}{name:<32} {seconds:>10.4f}s  {share:5.1f}%")
+        for name, value in sorted(self.counters.items()):
+            print(f"  {name:<32} {value:>12}")
+        if self.phases.get("simulation") and self.counters.get("simulated_ticks"):
+            print(f"  {'ticks/sec':<32} {self.counters['simulated_ticks'] / self.phases['simulation']:>12.0f}")
+        if self.phases.get("analysis.interface_search") and self.counters.get("dbf_evaluations"):
+            rate = self.counters["dbf_evaluations"] / self.phases["analysis.interface_search"]
+            print(f"  {'dbf evaluations/sec':<32} {rate:>12.0f}")
+
+PROFILER = Instrumentation()
+DEFAULT_PROFILE_FILE = "./Output/profile_metrics.json"
+
+
 class Task:
+    __slots__ = ("name", "wcet", "bcet", "deadline", "period", "priority")
+
     def __init__(self, name, wcet, bcet, deadline, period, priority):
         self.name = name
         self.wcet = wcet
@@ -36,12 +94,15 @@ class Task:
 
 
 class Component:
+    __slots__ = ("name", "core_name", "scheduling", "bdr_alpha", "bdr_delta", "bdr_updated", "tasks")
+
     def __init__(self, name, core_name, scheduling, bdr_params):
         self.name = name
         self.core_name = core_name
         self.scheduling = scheduling  
         self.bdr_alpha = bdr_params.get("alpha", 1.0)
         self.bdr_delta = bdr_params.get("delta", -1)
+        self.bdr_updated = False
         self.tasks = []
 
     def add_task(self, task):
@@ -52,6 +113,8 @@ class Component:
 
 
 class Core:
+    __slots__ = ("name", "speed", "components")
+
     def __init__(self, name, speed):
         self.name = name
         self.speed = speed
@@ -64,60 +127,300 @@ class Core:
         return f"Core({self.name}, Speed={self.speed}, Components={len(self.components)})"
 
 
-def load_system_model_from_csv(task_file, arch_file, budget_file):
+class TaskColumns:
+    """wcet, period, deadline and priority of one task set as NumPy columns, the input of the dbf kernels."""
+    __slots__ = ("wcet", "period", "deadline", "priority")
+
+    def __init__(self, wcet, period, deadline, priority):
+        self.wcet = wcet
+        self.period = period
+        self.deadline = deadline
+        self.priority = priority
+
+    @classmethod
+    def of(cls, tasks):
+        if isinstance(tasks, cls):
+            return tasks
+        return cls(np.array([task.wcet for task in tasks]), np.array([task.period for task in tasks]),
+                   np.array([task.deadline for task in tasks]), np.array([task.priority for task in tasks]))
+
+    def rows(self):
+        return zip(self.wcet.tolist(), self.period.tolist(), self.deadline.tolist(), self.priority.tolist())
+
+    def __len__(self):
+        return len(self.wcet)
+
+
+class SystemArrays:
+    """The tasks.csv and budgets.csv columns behind the objects, tasks grouped by component.
+
+    The tasks of component i are rows offsets[i]:offsets[i + 1], in their tasks.csv order. Components whose
+    tasks an AnalysisSession edits are listed in edited_components, their rows no longer match comp.tasks.
+    """
+    __slots__ = ("component_names", "component_index", "budget_alpha", "budget_delta", "task_names",
+                 "task_component", "wcet", "bcet", "period", "deadline", "priority", "offsets", "edited_components")
+
+    def __init__(self, component_names, budget_alpha, budget_delta, task_names, task_component,
+                 wcet, bcet, period, deadline, priority):
+        self.component_names = component_names
+        self.component_index = {name: i for i, name in enumerate(component_names)}
+        self.budget_alpha = budget_alpha
+        self.budget_delta = budget_delta
+        # A stable sort keeps the tasks.csv order inside each component, which fixes the order dbf sums in
+        order = np.argsort(task_component, kind="stable")
+        self.task_names = [task_names[i] for i in order.tolist()]
+        self.task_component = task_component[order]
+        self.wcet = wcet[order]
+        self.bcet = bcet[order]
+        self.period = period[order]
+        self.deadline = deadline[order]
+        self.priority = priority[order]
+        self.offsets = np.searchsorted(self.task_component, np.arange(len(component_names) + 1))
+        self.edited_components = set()
+
+    def component_tasks(self, name):
+        i = self.component_index[name]
+        rows = slice(self.offsets[i], self.offsets[i + 1])
+        return TaskColumns(self.wcet[rows], self.period[rows], self.deadline[rows], self.priority[rows])
+
+    def restore_budget_supply(self, system):
+        for i, comp in enumerate(system["components"].values()):
+            comp.bdr_alpha = self.budget_alpha[i].item()
+            comp.bdr_delta = self.budget_delta[i].item()
+            comp.bdr_updated = False
+
+class SystemValidationError(ValueError):
+    """Raised by the loader with every problem found in the input files, not only the first one."""
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__(f"{len(errors)} problem(s) in the input files:\n" + "\n".join(f"  - {error}" for error in errors))
+
+_SCHEDULERS = ("EDF", "FPS", "RM")
+_MODEL_CACHE_VERSION = 1
+MODEL_CACHE_FILE = ".system_model.npz"
+
+def _row_list(indices, limit=10):
+    # CSV line numbers, counting the header as line 1
+    lines = [str(i + 2) for i in indices[:limit]]
+    return ", ".join(lines) + (f" and {len(indices) - limit} more" if len(indices) > limit else "")
+
+@contextlib.contextmanager
+def _gc_paused():
+    # Bulk loads allocate millions of small tuples that never form cycles; collecting them is pure overhead
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+def _read_columns(path, required, optional, errors):
+    """Reads a CSV in one pass into a tuple of raw strings per column."""
+    with open(path, newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        rows = [row for row in reader if row]
+    missing = [name for name in required if name not in header]
+    if missing:
+        errors.append(f"{path}: missing column(s) {', '.join(missing)}")
+        return None
+    if len(set(map(len, rows))) > 1 or rows and len(rows[0]) != len(header):
+        ragged = [i for i, row in enumerate(rows) if len(row) != len(header)]
+        errors.append(f"{path}: wrong number of fields on line(s) {_row_list(ragged)}")
+        rows = [row if len(row) == len(header) else (row + [""] * len(header))[:len(header)] for row in rows]
+    data = list(zip(*rows)) if rows else [()] * len(header)
+    return {name: data[header.index(name)] for name in list(required) + [name for name in optional if name in header]}
+
+def _numeric_column(path, values, name, errors, blank=None):
+    # Blank cells become `blank` (reported as missing when None); unparsable cells are reported by line
+    try:
+        return np.array(values, dtype=float)
+    except ValueError:
+        pass
+    numbers = np.full(len(values), np.nan)
+    empty, bad = [], []
+    for i, value in enumerate(values):
+        if not value.strip():
+            empty.append(i)
+            if blank is not None:
+                numbers[i] = blank
+            continue
+        try:
+            numbers[i] = float(value)
+        except ValueError:
+            bad.append(i)
+    if empty and blank is None:
+        errors.append(f"{path}: empty '{name}' on line(s) {_row_list(empty)}")
+    if bad:
+        errors.append(f"{path}: non-numeric '{name}' on line(s) {_row_list(bad)}")
+    return numbers
+
+def _check(path, condition, message, errors):
+    failing = np.flatnonzero(~condition)
+    if len(failing):
+        errors.append(f"{path}: {message} on line(s) {_row_list(failing)}")
+
+def _check_unique(path, ids, name, errors):
+    values, counts = np.unique(ids, return_counts=True)
+    duplicates = values[counts > 1]
+    if len(duplicates):
+        errors.append(f"{path}: duplicate {name}(s) {', '.join(duplicates[:10].tolist())}")
+
+def read_system_columns(task_file, arch_file, budget_file):
+    """Reads the three input files into typed column arrays and validates them all at once."""
+    errors = []
+    with _gc_paused():
+        arch = _read_columns(arch_file, ("core_id", "speed_factor"), (), errors)
+        budgets = _read_columns(budget_file, ("component_id", "scheduler", "budget", "period", "core_id"), (), errors)
+        tasks = _read_columns(task_file, ("task_name", "wcet", "period", "component_id", "priority"), ("bcet", "deadline"), errors)
+    if errors:
+        raise SystemValidationError(errors)
+
+    columns = {
+        "core_id": np.array(arch["core_id"], dtype=str),
+        "speed_factor": _numeric_column(arch_file, arch["speed_factor"], "speed_factor", errors),
+        "component_id": np.array(budgets["component_id"], dtype=str),
+        "component_scheduler": np.array(budgets["scheduler"], dtype=str),
+        "component_core": np.array(budgets["core_id"], dtype=str),
+        "budget": _numeric_column(budget_file, budgets["budget"], "budget", errors),
+        "budget_period": _numeric_column(budget_file, budgets["period"], "period", errors),
+        "task_name": np.array(tasks["task_name"], dtype=str),
+        "task_component": np.array(tasks["component_id"], dtype=str),
+        "wcet": _numeric_column(task_file, tasks["wcet"], "wcet", errors),
+        "period": _numeric_column(task_file, tasks["period"], "period", errors),
+        "priority": _numeric_column(task_file, tasks["priority"], "priority", errors, blank=0),
+    }
+    # Optional columns fall back per cell: bcet to wcet, deadline to period
+    bcet = _numeric_column(task_file, tasks["bcet"], "bcet", errors, blank=np.nan) if "bcet" in tasks else None
+    bcet_given = ~np.isnan(bcet) if bcet is not None else np.zeros(len(columns["wcet"]), dtype=bool)
+    columns["bcet"] = np.where(bcet_given, bcet, columns["wcet"]) if bcet is not None else columns["wcet"].copy()
+    deadline = _numeric_column(task_file, tasks["deadline"], "deadline", errors, blank=np.nan) if "deadline" in tasks else None
+    deadline_given = ~np.isnan(deadline) if deadline is not None else np.zeros(len(columns["period"]), dtype=bool)
+    columns["deadline"] = np.where(deadline_given, deadline, columns["period"]) if deadline is not None else columns["period"].copy()
+
+    # NaN fails every comparison, so unparsable cells are not reported a second time as out of range
+    unparsed = np.isnan
+    _check_unique(arch_file, columns["core_id"], "core_id", errors)
+    _check(arch_file, unparsed(columns["speed_factor"]) | (columns["speed_factor"] > 0), "speed_factor must be > 0", errors)
+
+    _check(budget_file, np.isin(columns["component_scheduler"], _SCHEDULERS),
+           f"scheduler must be one of {', '.join(_SCHEDULERS)}", errors)
+    _check(budget_file, np.isin(columns["component_core"], columns["core_id"]), "core_id not in architecture.csv", errors)
+    _check(budget_file, unparsed(columns["budget_period"]) | (columns["budget_period"] > 0), "period must be > 0", errors)
+    _check(budget_file, unparsed(columns["budget"]) | unparsed(columns["budget_period"])
+           | ((columns["budget"] >= 0) & (columns["budget"] <= columns["budget_period"])),
+           "budget must be within 0..period", errors)
+
+    _check_unique(task_file, columns["task_name"], "task_name", errors)
+    _check(task_file, np.isin(columns["task_component"], columns["component_id"]), "component_id not in budgets.csv", errors)
+    _check(task_file, unparsed(columns["period"]) | (columns["period"] > 0), "period must be > 0", errors)
+    _check(task_file, unparsed(columns["wcet"]) | (columns["wcet"] >= 0), "wcet must be >= 0", errors)
+    _check(task_file, ~bcet_given | unparsed(columns["wcet"]) | ((columns["bcet"] >= 0) & (columns["bcet"] <= columns["wcet"])),
+           "bcet must be within 0..wcet", errors)
+    _check(task_file, ~deadline_given | (columns["deadline"] > 0), "deadline must be > 0", errors)
+    _check(task_file, unparsed(columns["priority"]) | (columns["priority"] == np.floor(columns["priority"])),
+           "priority must be an integer", errors)
+    if errors:
+        raise SystemValidationError(errors)
+    columns["priority"] = columns["priority"].astype(np.int64)
+
+    # A repeated component_id keeps its last row, as the original loader did, and the earlier rows are dropped
+    last_rows = {name: i for i, name in enumerate(columns["component_id"].tolist())}
+    if len(last_rows) < len(columns["component_id"]):
+        keep = np.zeros(len(columns["component_id"]), dtype=bool)
+        keep[list(last_rows.values())] = True
+        print(f"[WARNING] {budget_file}: repeated component_id(s), only the last row of each is used; "
+              f"line(s) {_row_list(np.flatnonzero(~keep))} ignored")
+        for name in ("component_id", "component_scheduler", "component_core", "budget", "budget_period"):
+            columns[name] = columns[name][keep]
+    return columns
+
+def _input_signature(paths):
+    return np.array([[os.stat(path).st_mtime_ns, os.stat(path).st_size] for path in paths], dtype=np.int64)
+
+def _load_cached_columns(cache_file, signature):
+    try:
+        with np.load(cache_file) as cached:
+            if int(cached["version"]) != _MODEL_CACHE_VERSION or not np.array_equal(cached["signature"], signature):
+                return None
+            return {name: cached[name] for name in cached.files if name not in ("version", "signature")}
+    except (OSError, KeyError, ValueError):
+        return None
+
+def load_system_model_from_csv(task_file, arch_file, budget_file, cache_file=None):
+    """Builds the system model; with cache_file, the validated columns are reused while the CSVs are unchanged."""
+    columns = None
+    if cache_file:
+        signature = _input_signature((task_file, arch_file, budget_file))
+        columns = _load_cached_columns(cache_file, signature)
+    if columns is None:
+        columns = read_system_columns(task_file, arch_file, budget_file)
+        if cache_file:
+            np.savez(cache_file, version=_MODEL_CACHE_VERSION, signature=signature, **columns)
+
+    with _gc_paused():
+        return _build_system(columns)
+
+def _build_system(columns):
     cores = {}
-    with open(arch_file, newline='') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            core_id = row["core_id"]
-            speed = float(row["speed_factor"])
-            cores[core_id] = Core(core_id, speed)
+    for core_id, speed in zip(columns["core_id"].tolist(), columns["speed_factor"].tolist()):
+        cores[core_id] = Core(core_id, speed)
 
+    component_names = columns["component_id"].tolist()
+    budget_alpha = columns["budget"] / columns["budget_period"]
+    budget_delta = np.ones(len(component_names), dtype=np.int64)  #DELTA values are set later on in the code so all good!
     components = {}
-    with open(budget_file, newline='') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            comp_id = row["component_id"]
-            core_id = row["core_id"]
-            scheduler = row["scheduler"]
-            budget = float(row["budget"])
-            period = float(row["period"])
-            alpha = budget / period
-            delta = 1  #DELTA values are set later on in the code so all good!
-            comp = Component(comp_id, core_id, scheduler, {"alpha": alpha, "delta": delta})
-            components[comp_id] = comp
-            cores[core_id].add_component(comp)
+    for comp_id, scheduler, core_id, alpha, delta in zip(
+            component_names, columns["component_scheduler"].tolist(), columns["component_core"].tolist(),
+            budget_alpha.tolist(), budget_delta.tolist()):
+        comp = Component(comp_id, core_id, scheduler, {"alpha": alpha, "delta": delta})
+        components[comp_id] = comp
+        cores[core_id].add_component(comp)
+
     tasks = {}
-    with open(task_file, newline='') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            task_name = row["task_name"]
-            wcet = float(row["wcet"])
-            bcet = float(row["bcet"]) if "bcet" in row and row["bcet"] else wcet
-            deadline = float(row["deadline"]) if "deadline" in row and row["deadline"] else float(row["period"])
-            period = float(row["period"])
-            priority = int(row["priority"]) if row["priority"] else 0
-            comp_id = row["component_id"]
-
-            task = Task(task_name, wcet, bcet, deadline, period, priority)
-            tasks[task_name] = task
-            components[comp_id].add_task(task)
-
-    return {
+    for task_name, wcet, bcet, deadline, period, priority, comp_id in zip(
+            columns["task_name"].tolist(), columns["wcet"].tolist(), columns["bcet"].tolist(), columns["deadline"].tolist(),
+            columns["period"].tolist(), columns["priority"].tolist(), columns["task_component"].tolist()):
+        task = Task(task_name, wcet, bcet, deadline, period, priority)
+        tasks[task_name] = task
+        components[comp_id].tasks.append(task)
+
+    system = {
         "cores": cores,
         "components": components,
         "tasks": tasks
     }
+    component_index = {name: i for i, name in enumerate(component_names)}
+    task_component = np.array([component_index[name] for name in columns["task_component"].tolist()], dtype=np.int64)
+    system["arrays"] = SystemArrays(component_names, budget_alpha, budget_delta, columns["task_name"].tolist(),
+                                    task_component, columns["wcet"], columns["bcet"], columns["period"],
+                                    columns["deadline"], columns["priority"])
+    return system
+
+_RT_STAT_COLUMNS = ["rt_p50", "rt_p90", "rt_p95", "rt_p99", "deadline_miss_ratio"]
 
-def export_solution_csv(system, response_times, filename=".\Output\solution.csv"):
+def export_solution_csv(system, response_times, filename=".\Output\solution.csv", columnar_file=None, analytic_wcrt=None,
+                        rt_stats=None):
     task_results = []
-    
+    task_component = {task.name: comp.name for comp in system["components"].values() for task in comp.tasks}
+    component_schedulable = {comp_name: 1 for comp_name in system["components"]}
+
     for task in system["tasks"].values():
-        rts = response_times.get(task.name, [])
-        avg_rt = round(sum(rts)/len(rts), 2) if rts else 0.0
-        max_rt = round(max(rts), 2) if rts else 0.0
+        if rt_stats is not None:
+            stats = rt_stats.get(task.name)
+            rts = stats is not None
+            avg_rt = round(stats["mean"], 2) if rts else 0.0
+            max_rt = stats["max"] if rts else 0.0
+        else:
+            rts = response_times.get(task.name, [])
+            avg_rt = round(sum(rts)/len(rts), 2) if rts else 0.0
+            max_rt = round(max(rts), 2) if rts else 0.0
         schedulable = 1 if rts and max_rt <= task.deadline else 0
-        comp_id = next(comp.name for comp in system["components"].values() if task in comp.tasks)
+        comp_id = task_component[task.name]
+        if not schedulable:
+            component_schedulable[comp_id] = 0
 
         task_results.append({
             "task_name": task.name,
@@ -126,18 +429,22 @@ def export_solution_csv(system, response_times, filename=".\Output\solution.csv"
             "avg_response_time": avg_rt,
             "max_response_time": max_rt
         })
-
-    component_schedulable = {}
-    for comp in system["components"].values():
-        comp_tasks = [res for res in task_results if res["component_id"] == comp.name]
-        all_schedulable = all(t["task_schedulable"] == 1 for t in comp_tasks)
-        component_schedulable[comp.name] = 1 if all_schedulable else 0
+        if analytic_wcrt is not None:
+            task_results[-1]["analytic_wcrt"] = round(analytic_wcrt[task.name], 2)
+        if rt_stats is not None:
+            for column in _RT_STAT_COLUMNS:
+                value = stats[column.removeprefix("rt_")] if rts else 0.0
+                task_results[-1][column] = round(value, 4) if column == "deadline_miss_ratio" else value
 
     with open(filename, mode='w', newline='') as csvfile:
         fieldnames = [
             "task_name", "component_id", "task_schedulable",
             "avg_response_time", "max_response_time", "component_schedulable"
         ]
+        if analytic_wcrt is not None:
+            fieldnames.append("analytic_wcrt")
+        if rt_stats is not None:
+            fieldnames.extend(_RT_STAT_COLUMNS)
         writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
         writer.writeheader()
 
@@ -147,8 +454,29 @@ def export_solution_csv(system, response_times, filename=".\Output\solution.csv"
 
     print(f"\n Exported results to '{filename}'")
 
+    if columnar_file:
+        np.savez(
+            columnar_file,
+            task_name=np.array([row["task_name"] for row in task_results]),
+            component_id=np.array([row["component_id"] for row in task_results]),
+            task_schedulable=np.array([row["task_schedulable"] for row in task_results], dtype=np.int8),
+            avg_response_time=np.array([row["avg_response_time"] for row in task_results], dtype=float),
+            max_response_time=np.array([row["max_response_time"] for row in task_results], dtype=float),
+            component_schedulable=np.array([row["component_schedulable"] for row in task_results], dtype=np.int8),
+            **({"analytic_wcrt": np.array([row["analytic_wcrt"] for row in task_results], dtype=float)}
+               if analytic_wcrt is not None else {}),
+            **({column: np.array([row[column] for row in task_results], dtype=float) for column in _RT_STAT_COLUMNS}
+               if rt_stats is not None else {}),
+        )
+        print(f" Exported columnar results to '{columnar_file}'")
+    return task_results
+
 def lcm(numbers):
-    return reduce(lambda x, y: (x * y) // gcd(int(x), int(y)), numbers)
+    # Exact on rationals, so float periods such as 12.5 work: lcm(a/b, c/d) = lcm(a, c) / gcd(b, d)
+    fractions = [Fraction(number).limit_denominator(10**6) for number in numbers]
+    result = reduce(lambda x, y: Fraction(x.numerator * y.numerator // gcd(x.numerator, y.numerator),
+                                          gcd(x.denominator, y.denominator)), fractions)
+    return int(result) if result.denominator == 1 else float(result)
 
 def half_half_transform(alpha, delta):
     if alpha >= 1.0:
@@ -159,14 +487,402 @@ def half_half_transform(alpha, delta):
     Csupply = alpha * Tsupply
     return Csupply,Tsupply  
 
-def run_simulation(system, max_time=None):
-    cores = system["cores"]
-    all_periods = [task.period for task in system["tasks"].values()]
-    sim_time = int(lcm(all_periods)) if max_time is None else int(max_time)
-    print(f"Simulating up to time = {sim_time} units")
+_TRACE_MAGIC = b"HSTRACE1"
+_TRACE_RECORD = struct.Struct("<IIQQ")
+
+class TraceWriter:
+    """Streams (core, start, end, task) execution segments to a compact binary file."""
+
+    def __init__(self, path, core_names, task_names):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.core_index = {name: i for i, name in enumerate(core_names)}
+        self.task_index = {name: i for i, name in enumerate(task_names)}
+        self.segments = 0
+        self.pending = None
+        self.file = open(path, "wb")
+        header = json.dumps({"cores": list(core_names), "tasks": list(task_names)}).encode("utf-8")
+        self.file.write(_TRACE_MAGIC + struct.pack("<I", len(header)) + header)
+
+    def write(self, core_name, start, end, task_name):
+        core, task = self.core_index[core_name], self.task_index[task_name]
+        # Back-to-back ticks of the same task are merged into one run-length segment
+        if self.pending and self.pending[0] == core and self.pending[1] == task and self.pending[3] == start:
+            self.pending[3] = end
+            return
+        self._flush_pending()
+        self.pending = [core, task, start, end]
+
+    def _flush_pending(self):
+        if self.pending:
+            core, task, start, end = self.pending
+            self.file.write(_TRACE_RECORD.pack(core, task, start, end))
+            self.segments += 1
+            self.pending = None
+
+    def close(self):
+        self._flush_pending()
+        self.file.close()
+
+    def append_part(self, path):
+        # Moves the segments of a trace written by a worker process behind the ones already written
+        self._flush_pending()
+        with open(path, "rb") as part:
+            part.seek(len(_TRACE_MAGIC))
+            header_size, = struct.unpack("<I", part.read(4))
+            part.seek(header_size, os.SEEK_CUR)
+            records = part.read()
+        self.file.write(records)
+        self.segments += len(records) // _TRACE_RECORD.size
+        os.remove(path)
+
+def read_trace(path):
+    with open(path, "rb") as f:
+        if f.read(len(_TRACE_MAGIC)) != _TRACE_MAGIC:
+            raise ValueError(f"{path} is not an execution trace file")
+        header_size, = struct.unpack("<I", f.read(4))
+        header = json.loads(f.read(header_size).decode("utf-8"))
+        while True:
+            record = f.read(_TRACE_RECORD.size)
+            if len(record) < _TRACE_RECORD.size:
+                break
+            core, task, start, end = _TRACE_RECORD.unpack(record)
+            yield header["cores"][core], start, end, header["tasks"][task]
+
+_BOUNDARY, _WAKEUP, _DEADLINE = 0, 1, 2
+
+def _next_boundary(time, period):
+    # First integer tick after `time` that starts a new period window of the task
+    boundary = int(ceil((floor(time / period) + 1) * period))
+    return max(boundary, time + 1)
+
+def _ticks_to_finish(wcet, speed):
+    # Ticks the per-tick `remaining -= 1/speed` decrement takes to use up wcet, float rounding included
+    if wcet <= 0:
+        return 0
+    scaled = wcet * speed
+    # The decrements round off less than scaled² · 2⁻⁵³ ticks in all, so away from a whole tick that is ceil
+    if abs(scaled - round(scaled)) > (scaled + 4) * scaled * 4e-16 + 1e-12:
+        return int(ceil(scaled))
+    remaining, ticks = wcet, 0
+    step = 1.0 / speed
+    while remaining > 0:
+        # Replayed exactly: while the difference stays in remaining's binade [low, 2·low), every decrement rounds
+        # step to the same multiple q of its ulp (after one step, once a tie has settled on the even neighbour)
+        low = 2.0 ** (frexp(remaining)[1] - 1)
+        remaining -= step
+        ticks += 1
+        if remaining < low:
+            continue
+        previous, remaining = remaining, remaining - step
+        ticks += 1
+        q = previous - remaining
+        if remaining < low or q <= 0:
+            continue
+        # The next `steps` decrements all start from an exact difference of at least low
+        steps = floor((Fraction(remaining) - Fraction(low) - Fraction(step)) / Fraction(q)) + 1
+        if steps > 0:
+            remaining -= steps * q
+            ticks += steps
+    return ticks
+
+def _task_sort_key(comp, task, index, time):
+    if comp.scheduling == "FPS":
+        return (task.priority, index)
+    elif comp.scheduling == "EDF":
+        return (time + task.deadline - (time % task.period), index)
+    return (0, index)
+
+def _refresh_budget(state, time):
+    # Budgets are replenished at every multiple of the supply period, so windows can be resolved lazily
+    window = time // state["replenish_ticks"]
+    if window != state["window"]:
+        state["window"] = window
+        state["used"] = 0
+
+def _budget_exhaustion_time(state, time):
+    budget, period = state["budget_ticks"], state["replenish_ticks"]
+    window_end = (time // period + 1) * period
+    if time + budget - state["used"] <= window_end:
+        return time + budget - state["used"]
+    if budget >= period:
+        return float("inf")
+    return window_end + budget
+
+def _core_state(time, events, comp_state, jobs, released_tasks):
+    # Everything that decides the schedule from `time` on, with absolute times made relative
+    return (
+        tuple(sorted((t - time, kind, ci, index) for t, _, kind, ci, index in events)),
+        tuple((state["used"] if state["window"] == time // state["replenish_ticks"] else 0, tuple(sorted(state["active"])))
+              for state in comp_state),
+        tuple(sorted(jobs.items())),
+        tuple(sorted((name, tuple(r - time for r in releases)) for name, releases in released_tasks.items() if releases)),
+    )
+
+def _simulate_core(core, component_supply_info, sim_time, response_times, trace=None, observe=None,
+                   repeat_period=None, stop_on_miss=False, exec_sampler=None):
+    """Simulates one core up to sim_time and returns (busy_time, observed_time, miss_time) per component.
+
+    observe maps a component name to the (start, end) interval in which its response times and busy time
+    are recorded (default: the whole run). With repeat_period, the run stops once the core state at a
+    multiple of it equals the state one period earlier, and the remaining periods are replayed from the log.
+    exec_sampler(task) gives the ticks of each released job instead of the task's wcet. With stop_on_miss
+    the run ends at the first deadline miss and miss_time is its time, otherwise it is None.
+    """
+    run = _core_run(core, component_supply_info, sim_time, response_times, trace, observe, repeat_period,
+                    stop_on_miss, exec_sampler)
+    next(run)
+    return _advance(run, float("inf"))[1]
+
+def _advance(run, until):
+    # Resumes a _core_run generator up to `until`: (time reached, None) or (end time, results) once finished
+    try:
+        return run.send(until), None
+    except StopIteration as done:
+        return float("inf"), done.value
+
+def _core_run(core, component_supply_info, sim_time, response_times, trace, observe, repeat_period,
+              stop_on_miss, exec_sampler):
+    # The body of _simulate_core as a generator, pausing at the first event at or after the time sent in
+    comps = [comp for comp in core.components if comp.name in component_supply_info]
+    busy_time = {comp.name: 0 for comp in comps}
+    comp_state = []
+    events = []
+    seq = 0
+
+    for ci, comp in enumerate(comps):
+        supply = component_supply_info[comp.name]
+        lo, hi = observe[comp.name] if observe else (0, sim_time)
+        state = {
+            "comp": comp,
+            "budget_ticks": int(ceil(supply["Csupply"])) if supply["Csupply"] > 0 else 0,
+            "replenish_ticks": int(ceil(supply["Tsupply"])),
+            "window": 0,
+            "used": 0,
+            "active": {},
+            "observe_from": lo,
+            "observe_until": hi,
+            "clipped": lo > 0 or hi < sim_time,
+        }
+        comp_state.append(state)
+        if comp.bdr_delta > 0:
+            heapq.heappush(events, (int(ceil(comp.bdr_delta)), seq, _WAKEUP, ci, None)); seq += 1
+        for index, task in enumerate(comp.tasks):
+            heapq.heappush(events, (0, seq, _BOUNDARY, ci, index)); seq += 1
+
+    # State is compared at multiples of the period once every component is past its initial delay
+    next_check = float("inf")
+    if repeat_period:
+        first = max([1] + [int(ceil(comp.bdr_delta)) for comp in comps])
+        next_check = int(ceil(first / repeat_period)) * repeat_period
+        if next_check + repeat_period >= sim_time:
+            next_check = float("inf")
+    last_state = None
+    log = []
+
+    finish_ticks = {}
+    released_tasks = defaultdict(deque)
+    jobs = {}
+    running = None
+    missed = None
+    event_count = preemptions = exhaustions = 0
+
+    time = 0
+    pause = yield
+    while time < sim_time:
+        if time >= pause:
+            pause = yield time
+        if time == next_check:
+            snapshot = _core_state(time, events, comp_state, jobs, released_tasks)
+            if snapshot == last_state:
+                _replay_log(log, time, repeat_period, sim_time, comp_state, busy_time, response_times, core, trace)
+                PROFILER.add("repeated_state_stops")
+                break
+            last_state = snapshot
+            log = []
+            next_check += repeat_period
+
+        event_count += 1
+        boundaries = []
+        while events and events[0][0] <= time:
+            _, _, kind, ci, index = heapq.heappop(events)
+            if kind == _BOUNDARY:
+                state = comp_state[ci]
+                task = state["comp"].tasks[index]
+                boundaries.append((ci, state, index, task))
+                heapq.heappush(events, (_next_boundary(time, task.period), seq, _BOUNDARY, ci, index)); seq += 1
+            elif kind == _DEADLINE:
+                # A job still pending at its deadline has missed it, whether or not it would run again
+                task = comp_state[ci]["comp"].tasks[index]
+                pending = released_tasks[task.name]
+                if pending and time - pending[0] >= task.deadline:
+                    missed = time
+        if missed is not None:
+            break
+
+        # Releases are only registered by components that are past their delay and still have budget
+        for ci, state, index, task in boundaries:
+            comp = state["comp"]
+            _refresh_budget(state, time)
+            if time < comp.bdr_delta or state["used"] >= state["budget_ticks"]:
+                continue
+            if time % task.period == 0:
+                released_tasks[task.name].append(time)
+                if exec_sampler is not None:
+                    finish_ticks[task.name] = exec_sampler(task)
+                elif task.name not in finish_ticks:
+                    finish_ticks[task.name] = _ticks_to_finish(task.wcet, core.speed)
+                jobs[task.name] = 0
+                if finish_ticks[task.name] > 0:
+                    state["active"][index] = task
+                    if stop_on_miss:
+                        heapq.heappush(events, (int(ceil(time + task.deadline)), seq, _DEADLINE, ci, index)); seq += 1
+                else:
+                    state["active"].pop(index, None)
 
+        horizon = min(events[0][0], sim_time) if events else sim_time
+        if horizon > next_check:
+            horizon = next_check
+
+        selected = None
+        for state in comp_state:
+            if not state["active"] or time < state["comp"].bdr_delta:
+                continue
+            _refresh_budget(state, time)
+            if state["used"] < state["budget_ticks"]:
+                selected = state
+                break
+
+        if selected is None:
+            time = horizon
+            continue
+
+        comp = selected["comp"]
+        if len(selected["active"]) == 1:
+            index, task = next(iter(selected["active"].items()))
+        else:
+            index, task = min(selected["active"].items(),
+                              key=lambda item: _task_sort_key(comp, item[1], item[0], time))
+        exhaustion = _budget_exhaustion_time(selected, time)
+        end = min(horizon, time + finish_ticks[task.name] - jobs[task.name], exhaustion)
+        run = end - time
+
+        jobs[task.name] += run
+        if selected["clipped"]:
+            busy_time[comp.name] += max(0, min(end, selected["observe_until"]) - max(time, selected["observe_from"]))
+        else:
+            busy_time[comp.name] += run
+        if end // selected["replenish_ticks"] == selected["window"]:
+            selected["used"] += run
+        else:
+            selected["window"] = end // selected["replenish_ticks"]
+            selected["used"] = end % selected["replenish_ticks"]
+        if running is not None and running != task.name and running in jobs:
+            preemptions += 1
+        running = task.name
+        if end == exhaustion:
+            exhaustions += 1
+            wakeup = (end // selected["replenish_ticks"] + 1) * selected["replenish_ticks"]
+            heapq.heappush(events, (wakeup, seq, _WAKEUP, comp_state.index(selected), None)); seq += 1
+
+        if trace is not None:
+            trace.write(core.name, time, end, task.name)
+        if repeat_period:
+            log.append((time, end, selected, task.name, None))
+        time = end
+
+        if jobs[task.name] >= finish_ticks[task.name]:
+            release = released_tasks[task.name].popleft()
+            if not selected["clipped"] or selected["observe_from"] <= release < selected["observe_until"]:
+                response_times[task.name].append(time - release)
+                if repeat_period:
+                    log.append((time, time, selected, task.name, time - release))
+            del jobs[task.name]
+            del selected["active"][index]
+            if stop_on_miss and time - release > task.deadline:
+                missed = time
+                break
+
+    observed = {state["comp"].name: max(0, min(time, state["observe_until"]) - state["observe_from"])
+                if missed is not None
+                else state["observe_until"] - state["observe_from"] for state in comp_state}
+    if PROFILER.enabled:
+        PROFILER.add("simulated_ticks", sim_time)
+        PROFILER.add("simulation_events", event_count)
+        PROFILER.add("preemptions", preemptions)
+        PROFILER.add("budget_exhaustions", exhaustions)
+        # Replenishments happen at every multiple of the supply period before the horizon
+        PROFILER.add("budget_replenishments", sum((sim_time - 1) // state["replenish_ticks"] for state in comp_state))
+    return busy_time, observed, missed
+
+def _replay_log(log, time, period, sim_time, comp_state, busy_time, response_times, core, trace):
+    # The last period repeats until sim_time: replay its runs and completions, the final copy cut at sim_time
+    window_start = time - period
+    for shift in range(period, sim_time - window_start, period):
+        cut = sim_time - shift
+        for start, end, state, task_name, response_time in log:
+            if start >= cut or (response_time is not None and end > cut):
+                continue
+            if response_time is not None:
+                if state["observe_from"] <= end - response_time + shift < state["observe_until"]:
+                    response_times[task_name].append(response_time)
+                continue
+            end = min(end, cut)
+            busy_time[state["comp"].name] += max(0, min(end + shift, state["observe_until"]) - max(start + shift, state["observe_from"]))
+            if trace is not None:
+                trace.write(core.name, start + shift, end + shift, task_name)
+
+class HorizonPolicy:
+    """How far run_simulation simulates each core.
+
+    hyperperiod  every core runs for the lcm of all task periods (default)
+    component    each component is observed over its second own hyperperiod (task periods and supply period),
+                 and a core runs until its components' last jobs can finish; components on a core still
+                 interfere, so this is an approximation
+    repeat       each core stops once its state repeats at a multiple of the core hyperperiod and the rest of
+                 the global hyperperiod is replayed, giving the same results as hyperperiod
+    window       the first `warmup` ticks are simulated but not recorded, then `window` ticks are observed
+    stop_on_miss ends the simulation at the first deadline miss, for pass/fail sweeps
+    """
+    MODES = ("hyperperiod", "component", "repeat", "window")
+
+    def __init__(self, mode="hyperperiod", window=None, warmup=0, stop_on_miss=False):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown horizon mode '{mode}', expected one of {', '.join(self.MODES)}")
+        if mode == "window" and not window or window is not None and window <= 0:
+            raise ValueError("The window horizon needs a positive window length")
+        if warmup < 0:
+            raise ValueError("The warm-up must not be negative")
+        self.mode = mode
+        self.window = window
+        self.warmup = warmup
+        self.stop_on_miss = stop_on_miss
+
+    def plan(self, core, component_supply_info, sim_time):
+        """Returns (end time, observed interval per component, repeat period) for one core."""
+        comps = [comp for comp in core.components if comp.name in component_supply_info]
+        replenish = {comp.name: int(ceil(component_supply_info[comp.name]["Tsupply"])) for comp in comps}
+        observe = {comp.name: (0, sim_time) for comp in comps}
+        if self.mode == "window":
+            end = self.warmup + self.window
+            return end, {comp.name: (self.warmup, end) for comp in comps}, None
+        if self.mode == "component":
+            end = 0
+            for comp in comps:
+                # The second component hyperperiod is observed, the first one absorbs the start-up delay
+                period = int(ceil(lcm([task.period for task in comp.tasks] + [replenish[comp.name]])))
+                until = 2 * period + int(ceil(max((task.deadline for task in comp.tasks), default=0)))
+                if until < sim_time:
+                    observe[comp.name] = (period, 2 * period)
+                end = max(end, min(until, sim_time))
+            return end, observe, None
+        if self.mode == "repeat" and comps:
+            periods = [task.period for comp in comps for task in comp.tasks] + list(replenish.values())
+            return sim_time, observe, int(ceil(lcm(periods)))
+        return sim_time, observe, None
+
+def _component_supply_info(system):
     component_supply_info = {}
-    valid_components = set()
 
     for comp in system["components"].values():
         alpha, delta = comp.bdr_alpha, comp.bdr_delta
@@ -175,109 +891,325 @@ def run_simulation(system, max_time=None):
             component_supply_info[comp.name] = {
                 "Csupply": Csupply,
                 "Tsupply": Tsupply,
-                "budget_left": Csupply,
-                "last_replenish": 0
             }
-            valid_components.add(comp.name)
         except ValueError as e:
             print(f"✗ ERROR: Skipping simulation for component {comp.name} due to invalid BDR (α={alpha}, Δ={delta}): {e}")
-
-    execution_log = []
+    return component_supply_info
+
+def _simulate_core_job(work):
+    core, component_supply_info, end, observe, repeat_period, trace_part, trace_names, profile = work
+    # Pool workers count into their own PROFILER and hand the counters back to the parent
+    PROFILER.enabled = profile
+    PROFILER.reset()
+    trace = TraceWriter(trace_part, *trace_names) if trace_part else None
     response_times = defaultdict(list)
-    released_tasks = defaultdict(list)
-    task_state = {}
-
-    for time in range(sim_time):
-        tick_log = {}
+    try:
+        busy_time, observed_time, _ = _simulate_core(core, component_supply_info, end, response_times, trace,
+                                                     observe, repeat_period)
+    finally:
+        if trace is not None:
+            trace.close()
+    return dict(response_times), busy_time, observed_time, dict(PROFILER.counters)
+
+_LOCKSTEP_TICKS = 10_000
+
+def _simulate_cores_until_miss(cores, component_supply_info, plans, response_times, busy_time, observed_time,
+                               trace=None, trace_names=None, make_sampler=None):
+    """Simulates the cores side by side and stops every one of them at the earliest deadline miss.
+
+    The cores advance together in slices of _LOCKSTEP_TICKS, each into its own results and trace part, so a
+    miss on one core is found before the others have run to their horizon. Cores that got past the earliest
+    miss are simulated again up to it. Returns (miss time or None, names of the cores missing at that time).
+    """
+    def start(i, end, observe, repeat_period):
+        part = TraceWriter(f"{trace.path}.{i}.part", *trace_names) if trace is not None else None
+        run = {"response_times": defaultdict(list), "trace": part, "time": 0, "result": None}
+        run["run"] = _core_run(cores[i], component_supply_info, end, run["response_times"], part, observe,
+                               repeat_period, True, make_sampler(i) if make_sampler else None)
+        next(run["run"])
+        return run
+
+    runs = [start(i, *plan) for i, plan in enumerate(plans)]
+    stop = None
+    until = 0
+    while True:
+        behind = [run for run in runs if run["result"] is None and (stop is None or run["time"] < stop)]
+        if not behind:
+            break
+        # Once a miss is known, the cores still behind it only need to catch up to see an earlier one
+        until = until + _LOCKSTEP_TICKS if stop is None else stop
+        for run in behind:
+            run["time"], run["result"] = _advance(run["run"], until)
+            if run["result"] is not None and run["result"][2] is not None:
+                stop = min(stop, run["result"][2]) if stop is not None else run["result"][2]
+
+    for i, (run, (end, observe, repeat_period)) in enumerate(zip(runs, plans)):
+        if stop is None or end <= stop or run["result"] is not None and run["result"][2] == stop:
+            continue
+        run["run"].close()
+        if run["trace"] is not None:
+            run["trace"].close()
+        observe = {name: (lo, max(lo, min(hi, stop))) for name, (lo, hi) in observe.items()}
+        runs[i] = run = start(i, stop, observe, repeat_period)
+        run["time"], run["result"] = _advance(run["run"], float("inf"))
+
+    missed = []
+    for core, run in zip(cores, runs):
+        core_busy, core_observed, miss = run["result"]
+        for task_name, rts in run["response_times"].items():
+            response_times[task_name].extend(rts)
+        busy_time.update(core_busy)
+        observed_time.update(core_observed)
+        if run["trace"] is not None:
+            run["trace"].close()
+            trace.append_part(run["trace"].path)
+        if miss is not None:
+            missed.append(core.name)
+    return stop, missed
+
+def run_simulation(system, max_time=None, trace_file=None, horizon=None, jobs=1):
+    horizon = horizon or HorizonPolicy()
+    cores = system["cores"]
+    all_periods = [task.period for task in system["tasks"].values()]
+    sim_time = int(ceil(lcm(all_periods))) if max_time is None else int(max_time)
+    print(f"Simulating up to time = {sim_time} units")
+    if horizon.mode != "hyperperiod" or horizon.stop_on_miss:
+        print(f"Horizon policy: {horizon.mode}{', stopping at the first deadline miss' if horizon.stop_on_miss else ''}")
 
-        for core in cores.values():
-            tick_log[core.name] = "Idle"
-            component_candidates = {}
+    component_supply_info = _component_supply_info(system)
 
+    # Event-driven: each core jumps between releases, completions, replenishments and budget exhaustion.
+    # Busy time is counted online; the execution trace is only kept when streamed to a file.
+    trace = TraceWriter(trace_file, list(cores), list(system["tasks"])) if trace_file else None
+    response_times = defaultdict(list)
+    busy_time = {}
+    observed_time = {}
+    try:
+        with PROFILER.phase("simulation.events"):
+            if horizon.stop_on_miss:
+                # The cores run side by side in this process, whatever --jobs, to stop them all at the same time
+                plans = [horizon.plan(core, component_supply_info, sim_time) for core in cores.values()]
+                stop, missed = _simulate_cores_until_miss(list(cores.values()), component_supply_info, plans,
+                                                          response_times, busy_time, observed_time, trace,
+                                                          (list(cores), list(system["tasks"])))
+                if stop is not None:
+                    print(f"✗ Deadline miss on {', '.join(missed)} at time {stop}: simulation stopped early")
+            elif jobs > 1 and len(cores) > 1:
+                _simulate_cores_parallel(system, component_supply_info, sim_time, horizon, jobs, trace_file, trace,
+                                         response_times, busy_time, observed_time)
+            else:
+                for core in cores.values():
+                    end, observe, repeat_period = horizon.plan(core, component_supply_info, sim_time)
+                    core_busy, core_observed, _ = _simulate_core(core, component_supply_info, end, response_times, trace,
+                                                                 observe, repeat_period)
+                    busy_time.update(core_busy)
+                    observed_time.update(core_observed)
+    finally:
+        if trace is not None:
+            trace.close()
+    if trace is not None:
+        print(f"Execution trace: {trace.segments} segments written to '{trace_file}'")
+
+    _print_simulation_report(system, response_times, busy_time, component_supply_info, observed_time)
+
+    return trace_file, response_times
+
+def _simulate_cores_parallel(system, component_supply_info, sim_time, horizon, jobs, trace_file, trace,
+                             response_times, busy_time, observed_time):
+    # Cores share nothing, so each one runs in its own process and the results are merged in core order
+    cores = list(system["cores"].values())
+    trace_names = (list(system["cores"]), list(system["tasks"]))
+    work = []
+    for i, core in enumerate(cores):
+        end, observe, repeat_period = horizon.plan(core, component_supply_info, sim_time)
+        trace_part = f"{trace_file}.{i}.part" if trace is not None else None
+        work.append((core, component_supply_info, end, observe, repeat_period, trace_part, trace_names,
+                     PROFILER.enabled))
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(cores))) as pool:
+        results = list(pool.map(_simulate_core_job, work))
+
+    for item, (core_response_times, core_busy, core_observed, counters) in zip(work, results):
+        trace_part = item[5]
+        for task_name, rts in core_response_times.items():
+            response_times[task_name].extend(rts)
+        busy_time.update(core_busy)
+        observed_time.update(core_observed)
+        PROFILER.merge(counters)
+        if trace_part:
+            trace.append_part(trace_part)
+
+def _print_simulation_report(system, response_times, busy_time, component_supply_info, observed_time):
+    with PROFILER.phase("simulation.report"):
+        print("\n--- SIMULATION RESULTS ---")
+        for task in system["tasks"].values():
+            rts = response_times.get(task.name, [])
+            if rts:
+                print(f"{task.name}: Avg RT = {sum(rts)/len(rts):.2f}, Max RT = {max(rts)}")
+            else:
+                print(f"{task.name}: Not executed")
+
+        print("\n--- WORST-CASE RESPONSE TIMES (WCRT) ---")
+        for task in system["tasks"].values():
+            rts = response_times.get(task.name, [])
+            if rts:
+                wcrt = max(rts)
+                print(f"{task.name}: WCRT = {wcrt}  |  Deadline = {task.deadline}  =>  {'✓' if wcrt <= task.deadline else '✗'}")
+            else:
+                print(f"{task.name}: No RT recorded")
+
+        print("\n--- RESOURCE UTILIZATION PER COMPONENT ---")
+        for core in system["cores"].values():
             for comp in core.components:
-                if comp.name not in valid_components:
+                if comp.name not in component_supply_info:
                     continue
-
-                supply = component_supply_info[comp.name]
-
-                if (time - supply["last_replenish"]) >= supply["Tsupply"]:
-                    supply["budget_left"] = supply["Csupply"]
-                    supply["last_replenish"] = time
-
-                if time < comp.bdr_delta or supply["budget_left"] <= 0:
+                if comp.name not in observed_time:
+                    print(f"Component {comp.name} on {core.name}: Not simulated")
                     continue
-
-                active_tasks = []
-                for task in comp.tasks:
-                    if time % task.period == 0:
-                        released_tasks[task.name].append(time)
-                        task_state[task.name] = {
-                            "remaining": task.wcet,  # Use original WCET
-                            "start": None
-                        }
-                    if task.name in task_state and task_state[task.name]["remaining"] > 0:
-                        active_tasks.append(task)
-
-                if active_tasks:
-                    if comp.scheduling == "FPS":
-                        active_tasks.sort(key=lambda x: x.priority)
-                    elif comp.scheduling == "EDF":
-                        active_tasks.sort(key=lambda x: time + x.deadline - (time % x.period))
-
-                    component_candidates[comp.name] = (comp, active_tasks[0])
-
-            if not component_candidates:
-                continue
-
-            selected_comp_name, (selected_comp, selected_task) = next(iter(component_candidates.items()))
-
-            # Execute task using proper speed scaling
-            if task_state[selected_task.name]["start"] is None:
-                task_state[selected_task.name]["start"] = time
-
-            task_state[selected_task.name]["remaining"] -= 1.0 / core.speed  # Use speed-corrected decrement
-            component_supply_info[selected_comp.name]["budget_left"] -= 1.0
-            tick_log[core.name] = selected_task.name
-
-            if task_state[selected_task.name]["remaining"] <= 0:
-                release = released_tasks[selected_task.name].pop(0)
-                rt = time - release + 1
-                response_times[selected_task.name].append(rt)
-                del task_state[selected_task.name]
-
-        execution_log.append(tick_log)
-
-    print("\n--- SIMULATION RESULTS ---")
-    for task in system["tasks"].values():
-        rts = response_times.get(task.name, [])
-        if rts:
-            print(f"{task.name}: Avg RT = {sum(rts)/len(rts):.2f}, Max RT = {max(rts)}")
-        else:
-            print(f"{task.name}: Not executed")
-
-    print("\n--- WORST-CASE RESPONSE TIMES (WCRT) ---")
-    for task in system["tasks"].values():
-        rts = response_times.get(task.name, [])
-        if rts:
-            wcrt = max(rts)
-            print(f"{task.name}: WCRT = {wcrt}  |  Deadline = {task.deadline}  =>  {'✓' if wcrt <= task.deadline else '✗'}")
+                utilization = busy_time[comp.name] / observed_time[comp.name] if observed_time[comp.name] else 0.0
+                print(f"Component {comp.name} on {core.name}: Utilization = {utilization:.2f}")
+
+# Shapes on [0, 1] that are stretched over [bcet, wcet]; parameters follow the name, e.g. "beta:2,5"
+EXECUTION_TIME_DISTRIBUTIONS = {
+    "uniform": (lambda rng, n: rng.random(n), ()),
+    "triangular": (lambda rng, n, mode: rng.triangular(0.0, mode, 1.0, n), (0.5,)),
+    "beta": (lambda rng, n, a, b: rng.beta(a, b, n), (2.0, 5.0)),
+}
+
+def parse_distribution(spec):
+    name, _, params = spec.partition(":")
+    if name not in EXECUTION_TIME_DISTRIBUTIONS:
+        raise ValueError(f"Unknown distribution '{name}', expected one of {', '.join(EXECUTION_TIME_DISTRIBUTIONS)}")
+    defaults = EXECUTION_TIME_DISTRIBUTIONS[name][1]
+    values = tuple(float(value) for value in params.split(",")) if params else defaults
+    if len(values) != len(defaults):
+        raise ValueError(f"Distribution '{name}' takes {len(defaults)} parameter(s), got {len(values)}")
+    return name, values
+
+class ExecutionTimeSampler:
+    """Draws the execution ticks of each job between bcet and wcet, in chunks from a seeded generator."""
+
+    def __init__(self, distribution, rng, speed, chunk=4096):
+        name, self.params = distribution
+        self.draw = EXECUTION_TIME_DISTRIBUTIONS[name][0]
+        self.rng = rng
+        self.speed = speed
+        self.chunk = chunk
+        self.buffer = []
+        self.position = 0
+
+    def __call__(self, task):
+        if self.position == len(self.buffer):
+            self.buffer = self.draw(self.rng, self.chunk, *self.params).tolist()
+            self.position = 0
+        fraction = self.buffer[self.position]
+        self.position += 1
+        return _ticks_to_finish(task.bcet + fraction * (task.wcet - task.bcet), self.speed)
+
+_MC_SYSTEM = {}
+
+def _init_monte_carlo_worker(cores, component_supply_info, sim_time, horizon, distribution, seed):
+    _MC_SYSTEM.update(cores=cores, component_supply_info=component_supply_info, sim_time=sim_time,
+                      horizon=horizon, distribution=distribution, seed=seed)
+
+def _monte_carlo_replication(replication):
+    cores, component_supply_info = _MC_SYSTEM["cores"], _MC_SYSTEM["component_supply_info"]
+    horizon = _MC_SYSTEM["horizon"]
+    response_times = defaultdict(list)
+    plans = [horizon.plan(core, component_supply_info, _MC_SYSTEM["sim_time"]) for core in cores]
+
+    def make_sampler(i):
+        # Every (replication, core) pair has its own stream, so results do not depend on the worker count
+        rng = np.random.default_rng([_MC_SYSTEM["seed"], replication, i])
+        return ExecutionTimeSampler(_MC_SYSTEM["distribution"], rng, cores[i].speed)
+
+    if horizon.stop_on_miss:
+        _simulate_cores_until_miss(cores, component_supply_info, plans, response_times, {}, {},
+                                   make_sampler=make_sampler)
+    else:
+        for i, (core, (end, observe, repeat_period)) in enumerate(zip(cores, plans)):
+            _simulate_core(core, component_supply_info, end, response_times, None, observe, repeat_period,
+                           exec_sampler=make_sampler(i))
+    # Response times are whole ticks, so exact counts per value merge cheaply across replications
+    return {name: np.bincount(np.array(rts, dtype=np.int64)) for name, rts in response_times.items() if rts}
+
+def _response_time_stats(counts, deadline, percentiles=(50, 90, 95, 99)):
+    values = np.nonzero(counts)[0]
+    total = int(counts.sum())
+    cumulative = np.cumsum(counts)
+    stats = {
+        "count": total,
+        "mean": float(np.dot(np.arange(len(counts)), counts) / total),
+        "max": int(values[-1]),
+        "deadline_miss_ratio": float(counts[int(floor(deadline)) + 1:].sum() / total),
+        "histogram": counts,
+    }
+    for q in percentiles:
+        # Nearest-rank percentile: the smallest response time covering q% of the jobs
+        stats[f"p{q}"] = int(np.searchsorted(cumulative, ceil(q / 100 * total)))
+    return stats
+
+def run_monte_carlo(system, replications, distribution=("uniform", ()), seed=0, max_time=None, horizon=None, jobs=1):
+    horizon = horizon or HorizonPolicy()
+    if horizon.mode == "repeat":
+        # A repeated core state says nothing about the execution times drawn after it
+        raise ValueError("The repeat horizon cannot be used with Monte Carlo sampling")
+    all_periods = [task.period for task in system["tasks"].values()]
+    sim_time = int(ceil(lcm(all_periods))) if max_time is None else int(max_time)
+    print(f"Monte Carlo: {replications} replication(s) of {sim_time} units, execution times ~ {distribution[0]}{list(distribution[1]) or ''} on [bcet, wcet], seed {seed}")
+
+    cores = list(system["cores"].values())
+    init_args = (cores, _component_supply_info(system), sim_time, horizon, distribution, seed)
+    started = perf_counter()
+    totals = {}
+    with PROFILER.phase("simulation.events"):
+        if jobs > 1 and replications > 1:
+            with ProcessPoolExecutor(max_workers=jobs, initializer=_init_monte_carlo_worker, initargs=init_args) as pool:
+                results = pool.map(_monte_carlo_replication, range(replications), chunksize=max(1, replications // (jobs * 4)))
+                for counts in results:
+                    _add_counts(totals, counts)
         else:
-            print(f"{task.name}: No RT recorded")
-
-    print("\n--- RESOURCE UTILIZATION PER COMPONENT ---")
-    total_sim_time = sim_time
-    for core in cores.values():
-        for comp in core.components:
-            if comp.name not in valid_components:
+            _init_monte_carlo_worker(*init_args)
+            for replication in range(replications):
+                _add_counts(totals, _monte_carlo_replication(replication))
+    seconds = perf_counter() - started
+    PROFILER.add("monte_carlo_replications", replications)
+
+    rt_stats = {name: _response_time_stats(totals[name], task.deadline)
+                for name, task in system["tasks"].items() if name in totals}
+    with PROFILER.phase("simulation.report"):
+        print(f"\n--- MONTE CARLO RESPONSE TIMES ({replications / seconds * 60 if seconds else float('inf'):.0f} hyperperiods/min) ---")
+        for task in system["tasks"].values():
+            stats = rt_stats.get(task.name)
+            if stats is None:
+                print(f"{task.name}: Not executed")
                 continue
-            comp_exec_time = sum(
-                1 for tick in execution_log for cname, tname in tick.items()
-                if cname == core.name and any(t.name == tname for t in comp.tasks)
-            )
-            utilization = comp_exec_time / total_sim_time
-            print(f"Component {comp.name} on {core.name}: Utilization = {utilization:.2f}")
-
-    return execution_log, response_times
+            print(f"{task.name}: Mean = {stats['mean']:.2f}, P50 = {stats['p50']}, P95 = {stats['p95']}, P99 = {stats['p99']}, "
+                  f"Max = {stats['max']}  |  Deadline = {task.deadline}, misses = {100 * stats['deadline_miss_ratio']:.2f}%")
+    return rt_stats
+
+def _add_counts(totals, counts):
+    for name, histogram in counts.items():
+        current = totals.get(name)
+        if current is None:
+            totals[name] = histogram
+            continue
+        if len(current) < len(histogram):
+            current, histogram = histogram, current
+        current[:len(histogram)] += histogram
+        totals[name] = current
+
+def export_rt_histograms(system, rt_stats, filename):
+    with open(filename, mode='w', newline='') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(["task_name", "response_time", "count"])
+        for name in system["tasks"]:
+            if name not in rt_stats:
+                continue
+            histogram = rt_stats[name]["histogram"]
+            for response_time in np.nonzero(histogram)[0]:
+                writer.writerow([name, int(response_time), int(histogram[response_time])])
+    print(f" Exported response-time histograms to '{filename}'")
 
 def dbf_edf(tasks, t):
     return sum(floor((t + task.period - task.deadline) / task.period) * task.wcet for task in tasks)
@@ -291,27 +1223,247 @@ def dbf_fps(tasks, t, current_task):
 def sbf_bdr(alpha, delta, t):
     return max(0, alpha * (t - delta))
 
+def dbf_edf_vector(tasks, ts):
+    tasks = TaskColumns.of(tasks)
+    demand = np.zeros(len(ts))
+    # One task at a time, in task order, so the sum rounds exactly as dbf_edf does
+    for wcet, period, deadline in zip(tasks.wcet.tolist(), tasks.period.tolist(), tasks.deadline.tolist()):
+        demand += np.floor((ts + period - deadline) / period) * wcet
+    return demand
+
+def dbf_fps_vector(tasks, ts):
+    # Same value as max(dbf_fps(tasks, t, τ) for τ in tasks), evaluated for every t at once
+    tasks = TaskColumns.of(tasks)
+    demand = np.zeros(len(ts))
+    levels = np.unique(tasks.priority).tolist()
+    for level_index, level in enumerate(levels):
+        interference = np.zeros(len(ts))
+        higher = tasks.priority < level
+        for wcet, period in zip(tasks.wcet[higher].tolist(), tasks.period[higher].tolist()):
+            interference += np.ceil(ts / period) * wcet
+        Ci = tasks.wcet[tasks.priority == level].max().item()
+        level_demand = Ci + interference
+        demand = level_demand if level_index == 0 else np.maximum(demand, level_demand)
+    return demand
+
+def _supply_meets_demand(alpha, delta, ts, dbf):
+    sbf = np.maximum(0, alpha * (ts - delta))
+    return not np.any(sbf < dbf)
+
+def _min_alpha_on_grid(alphas, delta, ts, dbf):
+    lag = ts - delta
+    if np.any(dbf[lag <= 0] > 0):
+        return None  # sbf is zero up to delta, no alpha can cover that demand
+    ahead = lag > 0
+    required = np.max(dbf[ahead] / lag[ahead]) if np.any(ahead) else 0.0
+    # Closed-form bound, then settle on the exact grid point the float comparison accepts
+    index = int(np.searchsorted(alphas, required))
+    tried = 1
+    while index > 0 and _supply_meets_demand(alphas[index - 1], delta, ts, dbf):
+        index -= 1
+        tried += 1
+    while index < len(alphas) and not _supply_meets_demand(alphas[index], delta, ts, dbf):
+        index += 1
+        tried += 1
+    PROFILER.add("alpha_candidates", tried)
+    return alphas[index] if index < len(alphas) else None
+
 def find_min_bdr_params(tasks, scheduling, max_time=100, verbose=False):
+    ts = np.arange(1, max_time + 1)
+    if scheduling == "EDF":
+        dbf = dbf_edf_vector(tasks, ts)
+    else:
+        dbf = dbf_fps_vector(tasks, ts)
+    PROFILER.add("dbf_evaluations", len(ts))
+    alphas = np.linspace(0.01, 1.0, 200)  # Finer resolution
     for delta in range(1, max_time + 1):  # Start at delta = 1
-        for alpha in np.linspace(0.01, 1.0, 200):  # Finer resolution
-            ok = True
-            for t in range(1, max_time + 1):
-                if scheduling == "EDF":
-                    dbf = dbf_edf(tasks, t)
-                else:
-                    dbf = max(dbf_fps(tasks, t, τ) for τ in tasks)
-                sbf = sbf_bdr(alpha, delta, t)
-                if sbf < dbf:
-                    ok = False
-                    break
-            if ok:
-                if verbose:
-                    print(f"✓ Found schedulable BDR: α = {alpha:.3f}, ∆ = {delta}")
-                return round(alpha, 3), delta
+        alpha = _min_alpha_on_grid(alphas, delta, ts, dbf)
+        if alpha is not None:
+            if verbose:
+                print(f"✓ Found schedulable BDR: α = {alpha:.3f}, ∆ = {delta}")
+            return round(alpha, 3), delta
     if verbose:
         print("✗ No schedulable BDR interface found")
     return None, None
 
+def _edf_step_points(tasks, horizon):
+    # Absolute deadlines D + kP up to the horizon, where dbf_edf steps up
+    points = [task.deadline + task.period * np.arange(0, floor((horizon - task.deadline) / task.period) + 1)
+              for task in tasks if task.deadline <= horizon]
+    return np.unique(np.concatenate(points)) if points else np.array([])
+
+def _max_demand_ratio(tasks, delta, points):
+    PROFILER.add("dbf_evaluations", len(points))
+    dbf = dbf_edf_vector(tasks, points)
+    if np.any(dbf[points <= delta] > 0):
+        return None
+    ahead = points > delta
+    return float(np.max(dbf[ahead] / (points[ahead] - delta))) if np.any(ahead) else 0.0
+
+# Most absolute deadlines _exact_edf_alpha enumerates for one component
+_EDF_MAX_POINTS = 1_000_000
+
+def _edf_alpha_bound(alpha, utilization):
+    # Just below the 1e-6 step find_exact_bdr_params rounds alpha up to, kept clear of U so the horizon is finite
+    step = ceil(max(alpha, utilization) * 1e6)
+    bound = (step - 1e-3) / 1e6
+    if bound < alpha or bound - utilization < 0.5e-6:
+        bound = (step + 1 - 1e-3) / 1e6
+    return bound
+
+def _exact_edf_alpha(tasks, delta):
+    utilization = sum(task.utilization() for task in tasks)
+    max_deadline = max(task.deadline for task in tasks)
+    hyperperiod = lcm([task.period for task in tasks]) + max_deadline
+    rate = sum(1 / task.period for task in tasks)
+    # dbf(t) <= U*t + slack, so no t beyond (alpha*delta + slack) / (alpha - U) has a demand ratio above alpha
+    slack = sum(max(task.period - task.deadline, 0) * task.utilization() for task in tasks)
+    probe = min(hyperperiod, max_deadline + max(task.period for task in tasks))
+    alpha = _max_demand_ratio(tasks, delta, _edf_step_points(tasks, probe))
+    if alpha is None:
+        return None
+    if hyperperiod * rate <= _EDF_MAX_POINTS:
+        horizon = hyperperiod
+        if alpha > utilization:
+            horizon = min(horizon, ceil((alpha * delta + slack) / (alpha - utilization)) + 1)
+        alpha = _max_demand_ratio(tasks, delta, _edf_step_points(tasks, horizon))
+        return None if alpha is None else max(alpha, utilization)
+
+    # Co-prime periods: stop where no later ratio can exceed a bound that rounds to the same alpha step,
+    # or at the point budget, where the bound is raised to match
+    bound = _edf_alpha_bound(alpha, utilization)
+    horizon = ceil((bound * delta + slack) / (bound - utilization)) + 1
+    horizon_cap = max_deadline + max(_EDF_MAX_POINTS / rate, delta + 2)
+    if horizon > horizon_cap:
+        bound = _edf_alpha_bound(utilization + (utilization * delta + slack) / (horizon_cap - 1 - delta), utilization)
+        horizon = ceil((bound * delta + slack) / (bound - utilization)) + 1
+    alpha = _max_demand_ratio(tasks, delta, _edf_step_points(tasks, horizon))
+    if alpha is None:
+        return None
+    return max(alpha, utilization) if alpha > bound else bound
+
+def _exact_fps_alpha(tasks, delta):
+    alpha = 0.0
+    for task in tasks:
+        hp_tasks = [τ for τ in tasks if τ.priority < task.priority]
+        # Scheduling points: higher-priority releases before the deadline, plus the deadline itself
+        points = [τ.period * np.arange(1, ceil(task.deadline / τ.period)) for τ in hp_tasks]
+        points = np.unique(np.concatenate(points + [np.array([task.deadline])]))
+        points = points[points > delta]
+        if len(points) == 0:
+            return None
+        PROFILER.add("dbf_evaluations", len(points))
+        rbf = task.wcet + sum((np.ceil(points / τ.period) * τ.wcet for τ in hp_tasks), np.zeros(len(points)))
+        alpha = max(alpha, float(np.min(rbf / (points - delta))))
+    return alpha
+
+def exact_bdr_alpha(tasks, scheduling, delta):
+    if not tasks:
+        return 0.0
+    if scheduling == "EDF":
+        return _exact_edf_alpha(tasks, delta)
+    return _exact_fps_alpha(tasks, delta)
+
+def find_exact_bdr_params(tasks, scheduling, delta=1, verbose=False):
+    # The minimal alpha never decreases with delta, so the smallest candidate delta is the only one to try
+    alpha = exact_bdr_alpha(tasks, scheduling, delta)
+    PROFILER.add("alpha_candidates")
+    if alpha is None or alpha > 1.0:
+        if verbose:
+            print("✗ No schedulable BDR interface found")
+        return None, None
+    alpha = ceil(alpha * 1e6) / 1e6  # Round up so the interface stays safe
+    if verbose:
+        print(f"✓ Found exact BDR: α = {alpha:.6f}, ∆ = {delta}")
+    return alpha, delta
+
+def sbf_bdr_inverse(alpha, delta, demand):
+    # Earliest t with sbf_bdr(alpha, delta, t) >= demand
+    return delta + demand / alpha if demand > 0 else 0.0
+
+def _fixed_point(start, alpha, delta, demand_at):
+    t = start
+    while True:
+        nxt = sbf_bdr_inverse(alpha, delta, demand_at(t))
+        if nxt <= t:
+            return t
+        t = nxt
+
+def _rta_fps(tasks, alpha, delta):
+    wcrt = {}
+    ordered = sorted(tasks, key=lambda task: task.priority)
+    hp_tasks, warm = [], 0.0
+    for level, group in groupby(ordered, key=lambda task: task.priority):
+        group = list(group)
+        hp_utilization = sum(τ.utilization() for τ in hp_tasks)
+        level_wcrt = warm
+        for task in group:
+            if hp_utilization >= alpha:
+                wcrt[task.name] = float("inf")  # Higher-priority demand alone outgrows the supply
+                continue
+            demand_at = lambda t, task=task: task.wcet + sum(ceil(t / τ.period) * τ.wcet for τ in hp_tasks)
+            # rbf of a lower priority level dominates every higher one, so their WCRT is a valid start
+            start = max(warm, sbf_bdr_inverse(alpha, delta, task.wcet + sum(τ.wcet for τ in hp_tasks)))
+            wcrt[task.name] = _fixed_point(start, alpha, delta, demand_at)
+            level_wcrt = max(level_wcrt, wcrt[task.name])
+        warm = level_wcrt
+        hp_tasks.extend(group)
+    return wcrt
+
+def _rta_edf(tasks, alpha, delta):
+    # Spuri's deadline-busy-period analysis with the BDR supply bound in place of a dedicated processor
+    if sum(task.utilization() for task in tasks) >= alpha:
+        return {task.name: float("inf") for task in tasks}
+    busy_period = _fixed_point(sbf_bdr_inverse(alpha, delta, sum(task.wcet for task in tasks)), alpha, delta,
+                               lambda t: sum(ceil(t / task.period) * task.wcet for task in tasks))
+    wcrt = {}
+    for task in tasks:
+        offsets = {0.0}
+        for other in tasks:
+            k = np.arange(0, ceil(busy_period / other.period) + 1)
+            candidates = k * other.period + other.deadline - task.deadline
+            offsets.update(float(a) for a in candidates if 0 <= a < busy_period)
+
+        def demand_at(t, a):
+            demand = (1 + floor(a / task.period)) * task.wcet
+            for other in tasks:
+                if other is task or other.deadline > a + task.deadline:
+                    continue
+                jobs = min(ceil(t / other.period), 1 + floor((a + task.deadline - other.deadline) / other.period))
+                demand += jobs * other.wcet
+            return demand
+
+        worst, finish = 0.0, 0.0
+        for a in sorted(offsets):
+            # The busy window grows with the offset, so the previous one is a valid start
+            start = max(finish, sbf_bdr_inverse(alpha, delta, demand_at(0, a)))
+            finish = _fixed_point(start, alpha, delta, lambda t: demand_at(t, a))
+            worst = max(worst, finish - a, task.wcet)
+        wcrt[task.name] = worst
+    return wcrt
+
+def response_time_analysis(tasks, scheduling, alpha, delta):
+    if not tasks:
+        return {}
+    if alpha is None or alpha <= 0:
+        return {task.name: float("inf") for task in tasks}
+    if scheduling == "EDF":
+        return _rta_edf(tasks, alpha, delta)
+    return _rta_fps(tasks, alpha, delta)
+
+def run_rta(system, demand=None):
+    print("\n--- RESPONSE-TIME ANALYSIS (BDR supply) ---")
+    wcrt = {}
+    for comp in system["components"].values():
+        print(f"\nComponent {comp.name} using {comp.scheduling} on BDR(α={comp.bdr_alpha}, ∆={comp.bdr_delta})")
+        tasks = _analysed_tasks(system, comp, demand)
+        comp_wcrt = response_time_analysis(tasks, comp.scheduling, comp.bdr_alpha, comp.bdr_delta)
+        for task in comp.tasks:
+            r = comp_wcrt[task.name]
+            print(f"  {task.name}: WCRT = {r:.2f}  |  Deadline = {task.deadline}  =>  {'✓' if r <= task.deadline else '✗'}")
+        wcrt.update(comp_wcrt)
+    return wcrt
+
 def validate_theorem1(child_bdrs, parent_alpha=1.0, parent_delta=0):
    
     total_alpha = sum(alpha for alpha, _ in child_bdrs)
@@ -329,13 +1481,163 @@ def derive_parent_bdr_from_children(child_bdrs, epsilon=1e-6):
     parent_delta = max(min_delta - epsilon, 0)
     return parent_alpha, parent_delta
 
-def run_analysis(system):
+_INTERFACE_CACHE_VERSION = 1
+DEFAULT_INTERFACE_CACHE = "./Output/interface_cache.sqlite"
+
+class InterfaceCache:
+    def __init__(self, path, max_entries=10000):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        # Recency of cache hits, written in close(): updating it on every hit would keep a write transaction open
+        # for the whole interface search and lock out other processes sharing the file
+        self.last_used = {}
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS interfaces "
+            "(key TEXT PRIMARY KEY, alpha, delta, csupply, tsupply, last_used REAL)"
+        )
+
+    @staticmethod
+    def key(tasks, scheduling, exact):
+        search = {"mode": "exact", "delta": 1} if exact else {"mode": "grid", "max_time": 100, "alphas": [0.01, 1.0, 200]}
+        rows = tasks.rows() if isinstance(tasks, TaskColumns) else (
+            (task.wcet, task.period, task.deadline, task.priority) for task in tasks)
+        task_set = sorted(rows)
+        payload = json.dumps([_INTERFACE_CACHE_VERSION, scheduling, search, task_set])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        row = self.conn.execute("SELECT alpha, delta FROM interfaces WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.last_used[key] = datetime.now().timestamp()
+        return row[0], row[1]
+
+    def put(self, key, alpha, delta):
+        Csupply = Tsupply = None
+        if alpha is not None:
+            try:
+                Csupply, Tsupply = half_half_transform(alpha, delta)
+            except ValueError:
+                pass
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO interfaces VALUES (?, ?, ?, ?, ?, ?)",
+                (key, None if alpha is None else float(alpha), delta, Csupply, Tsupply, datetime.now().timestamp())
+            )
+
+    def close(self):
+        # Least recently used entries beyond the size limit are dropped on close
+        with self.conn:
+            self.conn.executemany("UPDATE interfaces SET last_used = ? WHERE key = ?",
+                                  [(used, key) for key, used in self.last_used.items()])
+            self.conn.execute(
+                "DELETE FROM interfaces WHERE key NOT IN "
+                "(SELECT key FROM interfaces ORDER BY last_used DESC LIMIT ?)", (self.max_entries,)
+            )
+        self.conn.close()
+
+class SpeedScaledDemand:
+    """Task WCETs scaled to the ticks a core of a given speed factor spends on them, as the simulator does.
+
+    There is one table per distinct speed factor, shared by every component on cores of that speed. The tables
+    are filled up front from the tasks mapped to each core; other (wcet, speed) pairs are scaled on first use.
+    """
+
+    def __init__(self, system=None):
+        self.tables = {}
+        if system is not None:
+            for core in system["cores"].values():
+                for comp in core.components:
+                    for task in comp.tasks:
+                        self.wcet(task.wcet, core.speed)
+
+    def wcet(self, wcet, speed):
+        table = self.tables.setdefault(speed, {})
+        ticks = table.get(wcet)
+        if ticks is None:
+            ticks = table[wcet] = _ticks_to_finish(wcet, speed)
+        return ticks
+
+    def tasks(self, tasks, speed):
+        return [Task(task.name, self.wcet(task.wcet, speed), task.bcet, task.deadline, task.period, task.priority)
+                for task in tasks]
+
+def _analysed_tasks(system, comp, demand):
+    # Without demand tables the analysis sees the raw WCETs, whatever core the component runs on
+    if demand is None:
+        return comp.tasks
+    return demand.tasks(comp.tasks, system["cores"][comp.core_name].speed)
+
+def _interface_tasks(system, comp, demand, exact):
+    # The grid search only needs dbf, which unedited components evaluate straight from the system columns
+    arrays = system["arrays"]
+    if demand is None and not exact and comp.name not in arrays.edited_components:
+        return arrays.component_tasks(comp.name)
+    return _analysed_tasks(system, comp, demand)
+
+def _component_interface(work):
+    tasks, scheduling, exact = work
+    if exact:
+        return find_exact_bdr_params(tasks, scheduling)
+    return find_min_bdr_params(tasks, scheduling)
+
+def _profiled_component_interface(work):
+    # Pool workers count into their own PROFILER and hand the counters back to the parent
+    PROFILER.enabled = True
+    PROFILER.reset()
+    interface = _component_interface(work)
+    return interface, dict(PROFILER.counters)
+
+def run_analysis(system, exact=False, jobs=1, cache=None, demand=None):
     print("\n--- STATIC SCHEDULABILITY ANALYSIS ---")
+    if demand is not None:
+        print("[INFO] Task demand scaled to the speed factor of each component's core")
     core_bdr_summary = {}
 
-    for comp in system["components"].values():
-        print(f"\nComponent {comp.name} on Core {comp.core_name} using {comp.scheduling}")
-        alpha, delta = find_min_bdr_params(comp.tasks, comp.scheduling)
+    components = list(system["components"].values())
+    # Cached interfaces are keyed by the scaled WCETs, so a component meets its entry again only at the same demand
+    task_sets = [_interface_tasks(system, comp, demand, exact) for comp in components]
+    interfaces = [None] * len(components)
+    keys = [None] * len(components)
+    pending = []
+    for i, comp in enumerate(components):
+        if cache is not None:
+            keys[i] = cache.key(task_sets[i], comp.scheduling, exact)
+            interfaces[i] = cache.get(keys[i])
+        if interfaces[i] is None:
+            pending.append(i)
+
+    # Interface searches are independent per component; pool.map keeps results in component order
+    work = [(task_sets[i], components[i].scheduling, exact) for i in pending]
+    with PROFILER.phase("analysis.interface_search"):
+        if jobs > 1 and len(work) > 1:
+            chunksize = max(1, len(work) // (jobs * 4))
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                if PROFILER.enabled:
+                    results = []
+                    for interface, counters in pool.map(_profiled_component_interface, work, chunksize=chunksize):
+                        PROFILER.merge(counters)
+                        results.append(interface)
+                else:
+                    results = list(pool.map(_component_interface, work, chunksize=chunksize))
+        else:
+            results = [_component_interface(item) for item in work]
+    PROFILER.add("components_searched", len(work))
+
+    for i, (alpha, delta) in zip(pending, results):
+        interfaces[i] = (alpha, delta)
+        if cache is not None:
+            cache.put(keys[i], alpha, delta)
+
+    for comp, (alpha, delta) in zip(components, interfaces):
+        speed = f" (speed {system['cores'][comp.core_name].speed})" if demand is not None else ""
+        print(f"\nComponent {comp.name} on Core {comp.core_name}{speed} using {comp.scheduling}")
         if alpha is None:
             print("  ✗ No schedulable BDR interface found!")
         else:
@@ -348,20 +1650,593 @@ def run_analysis(system):
 
         core_bdr_summary.setdefault(comp.core_name, []).append((comp.bdr_alpha, comp.bdr_delta))
 
+    if cache is not None:
+        print(f"\n[INFO] Interface cache: {cache.hits} hit(s), {cache.misses} miss(es)")
+
     print("\n--- VALIDATING CORES WITH THEOREM 1 (Feng and Mok) ---")
+    with PROFILER.phase("analysis.theorem1"):
+        core_verdicts = _validate_cores(system, core_bdr_summary)
+    return core_verdicts
+
+def _validate_cores(system, core_bdr_summary):
+    core_verdicts = {}
     for core in system["cores"].values():
         child_bdRs = core_bdr_summary.get(core.name, [])
         parent_alpha, parent_delta = derive_parent_bdr_from_children(child_bdRs)
-        is_schedulable, _, _ = validate_theorem1(child_bdRs, parent_alpha, parent_delta)
+        # The derived parent is only reported: the children have to fit the whole core (alpha = 1, delta = 0)
+        is_schedulable, _, _ = validate_theorem1(child_bdRs)
+        core_verdicts[core.name] = is_schedulable
         result = "✓" if is_schedulable else "✗"
         print(f"Core {core.name}: Derived Parent BDR(α={parent_alpha}, ∆={parent_delta}) ⇒ {result}")
+    return core_verdicts
+
+
+class AnalysisSession:
+    """What-if edits on a loaded system; each edit re-runs only the interfaces and Theorem 1 checks it touches.
+
+    Every edit returns the schedulability delta as {"components": {name: (before, after)},
+    "cores": {name: (before, after)}, "system": (before, after)}, listing only components and cores that changed.
+    With speed_aware, interfaces are searched on the demand scaled to the speed of each component's core, so
+    moving a component or changing a core speed also re-runs the interfaces involved.
+    """
+
+    _TASK_FIELDS = ("wcet", "bcet", "deadline", "period", "priority")
+
+    def __init__(self, system, exact=False, cache=None, speed_aware=False):
+        self.system = system
+        self.exact = exact
+        self.cache = cache
+        self.demand = SpeedScaledDemand(system) if speed_aware else None
+        arrays = system["arrays"]
+        # Components without an interface fall back to their budgets.csv supply, as in run_analysis
+        self.budget_supply = {name: (arrays.budget_alpha[i].item(), arrays.budget_delta[i].item())
+                              for i, name in enumerate(arrays.component_names)}
+        self.task_component = {task.name: comp for comp in system["components"].values() for task in comp.tasks}
+        self.interfaces = {}
+        self.core_verdicts = {}
+        for comp in system["components"].values():
+            self._update_interface(comp)
+        for core in system["cores"].values():
+            self._update_core(core)
+
+    def component_schedulable(self, name):
+        return self.interfaces[name][0] is not None
+
+    def system_schedulable(self):
+        return all(alpha is not None for alpha, _ in self.interfaces.values()) and all(self.core_verdicts.values())
+
+    def _update_interface(self, comp):
+        key = None
+        interface = None
+        tasks = _interface_tasks(self.system, comp, self.demand, self.exact)
+        if self.cache is not None:
+            key = self.cache.key(tasks, comp.scheduling, self.exact)
+            interface = self.cache.get(key)
+        if interface is None:
+            interface = _component_interface((tasks, comp.scheduling, self.exact))
+            if self.cache is not None:
+                self.cache.put(key, *interface)
+        self.interfaces[comp.name] = interface
+        alpha, delta = interface
+        if alpha is None:
+            comp.bdr_alpha, comp.bdr_delta = self.budget_supply[comp.name]
+            comp.bdr_updated = False
+        else:
+            comp.bdr_alpha, comp.bdr_delta = alpha, delta
+            comp.bdr_updated = True
 
+    def _update_core(self, core):
+        child_bdrs = [(comp.bdr_alpha, comp.bdr_delta) for comp in core.components]
+        # Against the whole core, as validate_allocation does; a parent derived from the children themselves
+        # would only compare their sum with its own rounding
+        self.core_verdicts[core.name] = bool(validate_theorem1(child_bdrs)[0])
+
+    def _apply(self, components=(), cores=()):
+        before_components = {comp.name: self.component_schedulable(comp.name) for comp in components}
+        cores = {core.name: core for core in cores}
+        cores.update((comp.core_name, self.system["cores"][comp.core_name]) for comp in components)
+        before_cores = {name: self.core_verdicts[name] for name in cores}
+        before_system = self.system_schedulable()
+
+        for comp in components:
+            self._update_interface(comp)
+        for core in cores.values():
+            self._update_core(core)
+
+        delta = {"components": {}, "cores": {}, "system": (before_system, self.system_schedulable())}
+        for name, before in before_components.items():
+            if before != self.component_schedulable(name):
+                delta["components"][name] = (before, self.component_schedulable(name))
+        for name, before in before_cores.items():
+            if before != self.core_verdicts[name]:
+                delta["cores"][name] = (before, self.core_verdicts[name])
+        return delta
+
+    def add_task(self, component_name, task):
+        if task.name in self.system["tasks"]:
+            raise ValueError(f"Task {task.name} already exists")
+        comp = self.system["components"][component_name]
+        comp.add_task(task)
+        self.system["arrays"].edited_components.add(comp.name)
+        self.system["tasks"][task.name] = task
+        self.task_component[task.name] = comp
+        return self._apply(components=[comp])
+
+    def remove_task(self, task_name):
+        task = self.system["tasks"].pop(task_name)
+        comp = self.task_component.pop(task_name)
+        comp.tasks.remove(task)
+        self.system["arrays"].edited_components.add(comp.name)
+        return self._apply(components=[comp])
+
+    def modify_task(self, task_name, **changes):
+        unknown = set(changes) - set(self._TASK_FIELDS)
+        if unknown:
+            raise ValueError(f"Cannot modify task field(s): {', '.join(sorted(unknown))}")
+        task = self.system["tasks"][task_name]
+        for field, value in changes.items():
+            setattr(task, field, value)
+        comp = self.task_component[task_name]
+        self.system["arrays"].edited_components.add(comp.name)
+        return self._apply(components=[comp])
+
+    def move_component(self, component_name, core_name):
+        comp = self.system["components"][component_name]
+        if core_name == comp.core_name:
+            # Re-appending would change the component order, which sets the priority between components
+            schedulable = self.system_schedulable()
+            return {"components": {}, "cores": {}, "system": (schedulable, schedulable)}
+        old_core = self.system["cores"][comp.core_name]
+        new_core = self.system["cores"][core_name]
+        old_core.components.remove(comp)
+        new_core.add_component(comp)
+        comp.core_name = core_name
+        if self.demand is not None and old_core.speed != new_core.speed:
+            return self._apply(components=[comp], cores=[old_core, new_core])
+        # Otherwise the interface stays the same, so just the two cores' Theorem 1 checks change
+        return self._apply(cores=[old_core, new_core])
+
+    def set_core_speed(self, core_name, speed):
+        core = self.system["cores"][core_name]
+        core.speed = speed
+        if self.demand is not None:
+            return self._apply(components=list(core.components), cores=[core])
+        return self._apply(cores=[core])
+
+ALLOCATION_STRATEGIES = ("first-fit", "worst-fit")
+DEFAULT_ALLOCATION_FILE = "./Output/budgets_allocated.csv"
+# Loads are summed in placement order, Theorem 1 in component order; the margin absorbs the rounding difference
+_CORE_CAPACITY = 1.0 - 1e-9
+
+class CoreInterfaces:
+    """BDR interface of each component on each core speed, searched on demand and memoized per (component, speed).
+
+    Speeds that round every WCET of a component to the same ticks share one search. Components are seeded with
+    the interface run_analysis found on their own core when that analysis used the same demand tables.
+    """
+
+    def __init__(self, system, exact=False, demand=None):
+        self.system = system
+        self.exact = exact
+        self.demand = demand if demand is not None else SpeedScaledDemand()
+        self.interfaces = {}
+        self.searched = {}
+        if demand is not None:
+            for comp in system["components"].values():
+                if comp.bdr_updated:
+                    self.interfaces[comp.name, system["cores"][comp.core_name].speed] = (comp.bdr_alpha, comp.bdr_delta)
+
+    def get(self, name, core):
+        interface = self.interfaces.get((name, core.speed))
+        if interface is None:
+            comp = self.system["components"][name]
+            tasks = self.demand.tasks(comp.tasks, core.speed)
+            key = (name, tuple(task.wcet for task in tasks))
+            interface = self.searched.get(key)
+            if interface is None:
+                interface = self.searched[key] = _component_interface((tasks, comp.scheduling, self.exact))
+            self.interfaces[name, core.speed] = interface
+        return interface
+
+    def alpha(self, name, core):
+        # A component without an interface on this core never fits there
+        alpha = self.get(name, core)[0]
+        return float("inf") if alpha is None else alpha
+
+def allocate_components(system, strategy="first-fit", local_search=False, max_rounds=1000, interfaces=None):
+    """Places components on cores from their per-core (alpha, delta) interfaces so that every core passes Theorem 1.
+
+    first-fit packs the components by decreasing alpha onto the fastest cores first, to use as few cores as
+    possible; worst-fit puts each on the core with the most spare capacity, to balance load. Returns
+    (assignment, loads, unplaced), where loads are the sums of the alphas on each core.
+    """
+    if strategy not in ALLOCATION_STRATEGIES:
+        raise ValueError(f"Unknown allocation strategy '{strategy}', expected one of {', '.join(ALLOCATION_STRATEGIES)}")
+    if interfaces is None:
+        interfaces = CoreInterfaces(system)
+    # A lower speed factor takes fewer ticks per unit of WCET (see _ticks_to_finish), so those cores come first
+    cores = sorted(system["cores"].values(), key=lambda core: core.speed)
+    unplaced = []
+    assignment = {}
+    loads = {core.name: 0.0 for core in cores}
+
+    components = sorted(system["components"], key=lambda name: -interfaces.alpha(name, cores[0]) if cores else 0.0)
+    for name in components:
+        if not _place(name, strategy, cores, assignment, loads, interfaces):
+            unplaced.append(name)
+
+    if local_search:
+        refine = _empty_cores if strategy == "first-fit" else _balance_cores
+        refine(system, assignment, loads, interfaces, max_rounds)
+        # The moves may have left room for components that did not fit before
+        unplaced = [name for name in unplaced if not _place(name, strategy, cores, assignment, loads, interfaces)]
+    return assignment, loads, unplaced
+
+def _place(name, strategy, cores, assignment, loads, interfaces):
+    if strategy == "first-fit":
+        core = next((core for core in cores if loads[core.name] + interfaces.alpha(name, core) <= _CORE_CAPACITY), None)
+    else:
+        # Interfaces are searched lazily: no core loaded beyond the best load found so far can beat it
+        core, best = None, None
+        for candidate in sorted(cores, key=lambda core: loads[core.name]):
+            if best is not None and loads[candidate.name] >= best:
+                break
+            load = loads[candidate.name] + interfaces.alpha(name, candidate)
+            if load <= _CORE_CAPACITY and (best is None or load < best):
+                core, best = candidate, load
+    if core is None:
+        return False
+    assignment[name] = core.name
+    loads[core.name] += interfaces.alpha(name, core)
+    return True
+
+def _move(system, assignment, loads, interfaces, name, target):
+    source = system["cores"][assignment[name]]
+    loads[source.name] -= interfaces.alpha(name, source)
+    loads[target.name] += interfaces.alpha(name, target)
+    assignment[name] = target.name
+
+def _empty_cores(system, assignment, loads, interfaces, max_rounds):
+    # Tries to move every component of the least loaded core onto the other used cores, freeing it
+    cores = system["cores"]
+    for _ in range(max_rounds):
+        used = sorted((name for name in loads if any(core == name for core in assignment.values())), key=loads.get)
+        for victim in used:
+            members = sorted((name for name, core in assignment.items() if core == victim),
+                             key=lambda name: -interfaces.alpha(name, cores[victim]))
+            trial = dict(loads)
+            plan = {}
+            for name in members:
+                target = next((cores[core] for core in used if core != victim and
+                               trial[core] + interfaces.alpha(name, cores[core]) <= _CORE_CAPACITY), None)
+                if target is None:
+                    break
+                trial[target.name] += interfaces.alpha(name, target)
+                plan[name] = target
+            if len(plan) == len(members):
+                for name, target in plan.items():
+                    _move(system, assignment, loads, interfaces, name, target)
+                loads[victim] = 0.0
+                break
+        else:
+            return
+
+def _balance_cores(system, assignment, loads, interfaces, max_rounds):
+    # Hill climbing on the peak load: move or swap a component of the busiest core while that lowers the pair's peak
+    cores = system["cores"]
+    for _ in range(max_rounds):
+        busiest = max(loads, key=loads.get)
+        best = None
+        for name in [name for name, core in assignment.items() if core == busiest]:
+            out = interfaces.alpha(name, cores[busiest])
+            for other in cores.values():
+                if other.name == busiest:
+                    continue
+                moved = loads[other.name] + interfaces.alpha(name, other)
+                peak = max(loads[busiest] - out, moved)
+                if moved <= _CORE_CAPACITY and peak < loads[busiest] - 1e-12 and (best is None or peak < best[0]):
+                    best = (peak, name, None, other)
+                for swap in [swap for swap, core in assignment.items() if core == other.name]:
+                    source_load = loads[busiest] - out + interfaces.alpha(swap, cores[busiest])
+                    target_load = moved - interfaces.alpha(swap, other)
+                    peak = max(source_load, target_load)
+                    if source_load <= _CORE_CAPACITY and target_load <= _CORE_CAPACITY and peak < loads[busiest] - 1e-12 and (best is None or peak < best[0]):
+                        best = (peak, name, swap, other)
+        if best is None:
+            return
+        _, name, swap, other = best
+        _move(system, assignment, loads, interfaces, name, other)
+        if swap is not None:
+            _move(system, assignment, loads, interfaces, swap, cores[busiest])
+
+def validate_allocation(system, assignment, interfaces=None):
+    """Runs Theorem 1 on every core for the interfaces its assigned components have on that core.
+
+    Components missing from assignment stay on their current core; one without an interface there fails it.
+    """
+    if interfaces is None:
+        interfaces = CoreInterfaces(system)
+    verdicts = {}
+    for core in system["cores"].values():
+        child_bdrs = [interfaces.get(comp.name, core) for comp in system["components"].values()
+                      if assignment.get(comp.name, comp.core_name) == core.name]
+        verdicts[core.name] = (all(alpha is not None for alpha, _ in child_bdrs)
+                               and bool(validate_theorem1(child_bdrs)[0]))
+    return verdicts
+
+def write_allocated_budgets(budget_file, assignment, output_file):
+    # Same rows and columns as the input budgets.csv, only core_id changes
+    with open(budget_file, newline='') as f:
+        reader = csv.DictReader(f)
+        fieldnames = reader.fieldnames
+        rows = list(reader)
+    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+    with open(output_file, mode='w', newline='') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        writer.writeheader()
+        for row in rows:
+            row["core_id"] = assignment.get(row["component_id"], row["core_id"])
+            writer.writerow(row)
+
+def run_allocation(system, budget_file, output_file, strategy="first-fit", local_search=False, exact=False, demand=None):
+    print(f"\n--- COMPONENT ALLOCATION ({strategy}{' + local search' if local_search else ''}) ---")
+    interfaces = CoreInterfaces(system, exact, demand)
+    assignment, _, unplaced = allocate_components(system, strategy, local_search, interfaces=interfaces)
+    # Unplaced components keep their budgets.csv core in the written file, so they are validated there too
+    for name in unplaced:
+        assignment[name] = system["components"][name].core_name
+    verdicts = validate_allocation(system, assignment, interfaces)
+    loads = {}
+    for core in system["cores"].values():
+        members = [name for name, core_name in assignment.items() if core_name == core.name]
+        loads[core.name] = sum(interfaces.alpha(name, core) for name in members)
+        print(f"Core {core.name} (speed {core.speed}): load = {loads[core.name]:.3f}, {len(members)} component(s) "
+              f"=> {'✓' if verdicts[core.name] else '✗'}")
+    used = len(set(assignment.values()))
+    print(f"Cores used: {used}/{len(system['cores'])}, peak load = {max(loads.values(), default=0.0):.3f}")
+    for name in unplaced:
+        fits_nowhere = all(interfaces.get(name, core)[0] is None for core in system["cores"].values())
+        reason = "no BDR interface on any core" if fits_nowhere else "does not fit on any core"
+        print(f"  ✗ {name} not placed ({reason}), kept on {assignment[name]}")
+    write_allocated_budgets(budget_file, assignment, output_file)
+    passed = sum(verdicts.values())
+    print(f"{'✓' if passed == len(verdicts) else '✗'} Allocated budgets pass Theorem 1 on {passed}/{len(verdicts)} core(s)")
+    print(f"[INFO] Allocated budgets saved to: {output_file}")
+    return assignment, verdicts
+
+def _input_files(input_dir):
+    return (os.path.join(input_dir, "tasks.csv"),
+            os.path.join(input_dir, "architecture.csv"),
+            os.path.join(input_dir, "budgets.csv"))
+
+def run_case(input_dir, output_file, exact=False, jobs=1, cache_file=None, cache_size=10000, trace_file=None,
+             columnar_file=None, profile_file=None, cprofile_file=None, rta=False, simulate=True, horizon=None,
+             monte_carlo=None, input_cache=False, allocate=None, local_search=False, allocation_file=None,
+             speed_aware=False):
+    tasks_file, arch_file, budgets_file = _input_files(input_dir)
+    stats = {}
+    started = perf_counter()
+    PROFILER.enabled = bool(profile_file)
+    PROFILER.reset()
+    profiler = cProfile.Profile() if cprofile_file else None
+    if profiler is not None:
+        profiler.enable()
+
+    with PROFILER.phase("load"):
+        model_cache = os.path.join(input_dir, MODEL_CACHE_FILE) if input_cache else None
+        original_system = load_system_model_from_csv(tasks_file, arch_file, budgets_file, cache_file=model_cache)
+
+    print("=== System Overview ===")
+    for core in original_system["cores"].values():
+        print(core)
+        for comp in core.components:
+            print("  ", comp)
+            for task in comp.tasks:
+                print("    ", task)
+
+    # Analysis updates the interfaces in place; the simulation then runs on the budgets.csv supply again
+    print("\n--- Running Static Analysis ---")
+    analysis_started = perf_counter()
+    cache = InterfaceCache(cache_file, cache_size) if cache_file else None
+    # Analysis, RTA and allocation share the per-speed tables of scaled WCETs
+    demand = SpeedScaledDemand(original_system) if speed_aware else None
+    try:
+        with PROFILER.phase("analysis"):
+            core_verdicts = run_analysis(original_system, exact=exact, jobs=jobs, cache=cache, demand=demand)
+    finally:
+        if cache is not None:
+            cache.close()
+    stats["analysis_seconds"] = perf_counter() - analysis_started
+
+    if allocate:
+        with PROFILER.phase("allocation"):
+            run_allocation(original_system, budgets_file, allocation_file or DEFAULT_ALLOCATION_FILE, allocate, local_search,
+                           exact=exact, demand=demand)
+
+    analytic_wcrt = None
+    if rta or not simulate:
+        with PROFILER.phase("rta"):
+            analytic_wcrt = run_rta(original_system, demand=demand)
+
+    rt_stats = None
+    if monte_carlo:
+        replications, distribution, seed = monte_carlo
+        print("\n--- Running Monte Carlo Simulation ---")
+        simulation_started = perf_counter()
+        original_system["arrays"].restore_budget_supply(original_system)
+        with PROFILER.phase("simulation"):
+            rt_stats = run_monte_carlo(original_system, replications, distribution, seed, horizon=horizon, jobs=jobs)
+        stats["simulation_seconds"] = perf_counter() - simulation_started
+        response_times = None
+    elif simulate:
+        print("\n--- Running Simulation ---")
+        simulation_started = perf_counter()
+        original_system["arrays"].restore_budget_supply(original_system)
+        with PROFILER.phase("simulation"):
+            trace_file, response_times = run_simulation(original_system, trace_file=trace_file, horizon=horizon, jobs=jobs)
+        stats["simulation_seconds"] = perf_counter() - simulation_started
+    else:
+        # Without simulation the analytic bound stands in for the observed response times
+        response_times = {name: [wcrt] for name, wcrt in analytic_wcrt.items()}
+        stats["simulation_seconds"] = 0.0
+
+    print("\n--- Exporting results ---")
+    with PROFILER.phase("export"):
+        task_results = export_solution_csv(original_system, response_times, filename=output_file, columnar_file=columnar_file,
+                                           analytic_wcrt=analytic_wcrt, rt_stats=rt_stats)
+        if rt_stats is not None:
+            export_rt_histograms(original_system, rt_stats, os.path.splitext(output_file)[0] + "_rt_histogram.csv")
+
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(cprofile_file)
+        print(f"\n[INFO] cProfile stats saved to: {cprofile_file}")
+
+    stats.update({
+        "cores": len(original_system["cores"]),
+        "components": len(original_system["components"]),
+        "tasks": len(original_system["tasks"]),
+        "schedulable_tasks": sum(row["task_schedulable"] for row in task_results),
+        "schedulable_components": len({row["component_id"] for row in task_results if row["component_schedulable"]}),
+        "theorem1_cores_ok": sum(1 for ok in core_verdicts.values() if ok),
+        "system_schedulable": int(all(row["component_schedulable"] for row in task_results) and all(core_verdicts.values())),
+        "total_seconds": perf_counter() - started,
+    })
+
+    if profile_file:
+        PROFILER.report()
+        os.makedirs(os.path.dirname(profile_file) or ".", exist_ok=True)
+        with open(profile_file, "w", encoding="utf-8") as f:
+            json.dump(dict(PROFILER.to_dict(), input_dir=input_dir, total_seconds=stats["total_seconds"]), f, indent=2)
+        print(f"\n[INFO] Profile metrics saved to: {profile_file}")
+        PROFILER.enabled = False
+    return stats
+
+def expand_input_dirs(patterns):
+    input_dirs = []
+    for pattern in patterns:
+        matches = sorted(path for path in glob.glob(pattern) if os.path.isdir(path))
+        input_dirs.extend(matches if matches else [pattern])
+    return input_dirs
+
+def _run_batch_case(work):
+    input_dir, case_dir, exact, cache_file, cache_size, profile, rta, simulate, horizon, monte_carlo, input_cache, \
+        allocate, local_search, speed_aware = work
+    solution_file = os.path.join(case_dir, "solution.csv")
+    row = {"case": os.path.basename(case_dir), "input_dir": input_dir, "status": "ok", "solution_file": solution_file}
+    started = perf_counter()
+    # Each case keeps its own log instead of sharing the dated Logger file
+    with open(os.path.join(case_dir, "Analysis_Log.txt"), "w", encoding="utf-8") as log:
+        with contextlib.redirect_stdout(log):
+            try:
+                for path in _input_files(input_dir):
+                    if not os.path.isfile(path):
+                        raise FileNotFoundError(f"Required file not found: {path}")
+                profile_file = os.path.join(case_dir, "profile_metrics.json") if profile else None
+                row.update(run_case(input_dir, solution_file, exact=exact, cache_file=cache_file, cache_size=cache_size,
+                                    profile_file=profile_file, rta=rta, simulate=simulate, horizon=horizon,
+                                    monte_carlo=monte_carlo, input_cache=input_cache, allocate=allocate,
+                                    local_search=local_search, allocation_file=os.path.join(case_dir, "budgets_allocated.csv"),
+                                    speed_aware=speed_aware))
+            except Exception as e:
+                print(f"✗ ERROR: {e}")
+                row["status"] = f"error: {e}"
+                row["total_seconds"] = perf_counter() - started
+    return row
+
+def run_batch(input_dirs, output_dir, summary_file=None, jobs=1, exact=False, cache_file=None, cache_size=10000,
+              profile=False, rta=False, simulate=True, horizon=None, monte_carlo=None, input_cache=False, allocate=None,
+              local_search=False, speed_aware=False):
+    summary_file = summary_file or os.path.join(output_dir, "batch_summary.csv")
+    work = []
+    case_names = set()
+    for input_dir in input_dirs:
+        name = base = os.path.basename(os.path.normpath(input_dir))
+        suffix = 1
+        while name in case_names:
+            suffix += 1
+            name = f"{base}_{suffix}"
+        case_names.add(name)
+        case_dir = os.path.join(output_dir, name)
+        os.makedirs(case_dir, exist_ok=True)
+        work.append((input_dir, case_dir, exact, cache_file, cache_size, profile, rta, simulate, horizon, monte_carlo,
+                     input_cache, allocate, local_search, speed_aware))
+
+    print(f"[INFO] Running {len(work)} cases with {jobs} worker(s)")
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            rows = []
+            for row in pool.map(_run_batch_case, work):
+                print(f"  {row['case']}: {row['status']} ({row['total_seconds']:.2f}s)")
+                rows.append(row)
+    else:
+        rows = []
+        for item in work:
+            row = _run_batch_case(item)
+            print(f"  {row['case']}: {row['status']} ({row['total_seconds']:.2f}s)")
+            rows.append(row)
+
+    fieldnames = [
+        "case", "input_dir", "status", "cores", "components", "tasks",
+        "schedulable_tasks", "schedulable_components", "theorem1_cores_ok", "system_schedulable",
+        "analysis_seconds", "simulation_seconds", "total_seconds", "solution_file"
+    ]
+    os.makedirs(os.path.dirname(summary_file) or ".", exist_ok=True)
+    with open(summary_file, mode='w', newline='') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({key: round(value, 4) if isinstance(value, float) else value for key, value in row.items()})
+
+    print(f"\n[INFO] Batch summary saved to: {summary_file}")
+    return rows
 
 def main():
     parser = argparse.ArgumentParser(description="Hierarchical Scheduling Simulator with BDR Model")
-    parser.add_argument('input_dir', type=str, help="Directory containing tasks.csv, architecture.csv, and budgets.csv")
+    parser.add_argument('input_dir', type=str, nargs='+', help="Directory containing tasks.csv, architecture.csv, and budgets.csv (several directories or glob patterns run in batch mode)")
     parser.add_argument('--output', type=str, default="./Output/solution.csv", help="Path to output CSV file")
+    parser.add_argument('--jobs', type=int, default=1, help="Number of worker processes (per-component interface search and per-core simulation, or per case in batch mode)")
+    parser.add_argument('--exact-interface', action='store_true', help="Compute exact minimal BDR interfaces from dbf step points instead of the alpha grid")
+    parser.add_argument('--speed-aware', action='store_true', help="Scale task demand to the speed factor of each component's core in the analysis, as the simulator does")
+    parser.add_argument('--cache', type=str, nargs='?', const=DEFAULT_INTERFACE_CACHE, default=None, help=f"Reuse BDR interfaces of unchanged components from an on-disk cache (default file: {DEFAULT_INTERFACE_CACHE})")
+    parser.add_argument('--cache-size', type=int, default=10000, help="Maximum number of cached interfaces; least recently used entries are dropped")
+    parser.add_argument('--input-cache', action='store_true', help=f"Keep the parsed and validated input columns in {MODEL_CACHE_FILE} next to the CSVs and reuse them while the CSVs are unchanged")
+    parser.add_argument('--npz', type=str, default=None, help="Also write the results as NumPy columns to this .npz file")
+    parser.add_argument('--trace', type=str, default=None, help="Stream the execution trace as binary (core, start, end, task) segments to this file")
+    parser.add_argument('--profile', type=str, nargs='?', const=DEFAULT_PROFILE_FILE, default=None, help=f"Print a per-phase time and counter breakdown and save it as JSON (default file: {DEFAULT_PROFILE_FILE})")
+    parser.add_argument('--cprofile', type=str, default=None, help="Also dump cProfile statistics of the whole run to this file")
+    parser.add_argument('--rta', action='store_true', help="Compute analytic worst-case response times against each component's BDR supply and add them to the solution")
+    parser.add_argument('--no-simulation', action='store_true', help="Skip the simulation and report the analytic response times instead (implies --rta)")
+    parser.add_argument('--horizon', choices=HorizonPolicy.MODES, default="hyperperiod", help="How long to simulate: the global hyperperiod, per-component hyperperiods, until each core's state repeats, or a fixed window")
+    parser.add_argument('--window', type=int, default=None, help="Observed ticks for --horizon window")
+    parser.add_argument('--warmup', type=int, default=0, help="Ticks simulated before the observed window for --horizon window")
+    parser.add_argument('--stop-on-miss', action='store_true', help="Stop the simulation at the first deadline miss (pass/fail runs)")
+    parser.add_argument('--monte-carlo', type=int, default=None, metavar="N", help="Replace the simulation by N replications with execution times drawn between bcet and wcet")
+    parser.add_argument('--mc-dist', type=str, default="uniform", help="Execution-time distribution on [bcet, wcet]: uniform, triangular[:mode] or beta[:a,b] (default: uniform)")
+    parser.add_argument('--seed', type=int, default=0, help="Seed of the Monte Carlo replications")
+    parser.add_argument('--allocate', choices=ALLOCATION_STRATEGIES, default=None, help="Re-place components on cores from their BDR interfaces: first-fit uses as few cores as possible, worst-fit balances load")
+    parser.add_argument('--local-search', action='store_true', help="Refine the --allocate result by moving and swapping components")
+    parser.add_argument('--allocation-output', type=str, default=DEFAULT_ALLOCATION_FILE, help="Where --allocate writes the budgets.csv with the new core_id column")
+    parser.add_argument('--batch', action='store_true', help="Run in batch mode even for a single input directory")
+    parser.add_argument('--batch-output', type=str, default="./Output/batch", help="Directory receiving one sub-directory with solution.csv and log per case")
+    parser.add_argument('--summary', type=str, default=None, help="Path of the consolidated batch CSV (default: <batch-output>/batch_summary.csv)")
     args = parser.parse_args()
+    try:
+        horizon = HorizonPolicy(args.horizon, window=args.window, warmup=args.warmup, stop_on_miss=args.stop_on_miss)
+        monte_carlo = (args.monte_carlo, parse_distribution(args.mc_dist), args.seed) if args.monte_carlo else None
+        if monte_carlo and args.horizon == "repeat":
+            raise ValueError("--horizon repeat cannot be combined with --monte-carlo")
+    except ValueError as e:
+        parser.error(str(e))
+
+    input_dirs = expand_input_dirs(args.input_dir)
+    if args.batch or len(input_dirs) > 1:
+        run_batch(input_dirs, args.batch_output, args.summary, jobs=args.jobs, exact=args.exact_interface,
+                  cache_file=args.cache, cache_size=args.cache_size, profile=bool(args.profile),
+                  rta=args.rta, simulate=not args.no_simulation, horizon=horizon, monte_carlo=monte_carlo,
+                  input_cache=args.input_cache, allocate=args.allocate, local_search=args.local_search,
+                  speed_aware=args.speed_aware)
+        return
 
     timestamp = datetime.now().strftime("%d-%m-%Y")
     log_path = f"./Output/Analysis_Logs_{timestamp}.txt"
@@ -371,35 +2246,21 @@ def main():
 
     print(f"[INFO] Console output is being saved to: {log_path}\n")
 
-    tasks_file = os.path.join(args.input_dir, "tasks.csv")
-    arch_file = os.path.join(args.input_dir, "architecture.csv")
-    budgets_file = os.path.join(args.input_dir, "budgets.csv")
-
-    for path in [tasks_file, arch_file, budgets_file]:
+    input_dir = input_dirs[0]
+    for path in _input_files(input_dir):
         if not os.path.isfile(path):
             print(f"Error: Required file not found: {path}")
             sys.exit(1)
 
-    original_system = load_system_model_from_csv(tasks_file, arch_file, budgets_file)
-
-    print("=== System Overview ===")
-    for core in original_system["cores"].values():
-        print(core)
-        for comp in core.components:
-            print("  ", comp)
-            for task in comp.tasks:
-                print("    ", task)
-
-    print("\n--- Running Static Analysis ---")
-    analysis_system = copy.deepcopy(original_system)
-    run_analysis(analysis_system)
-
-    print("\n--- Running Simulation ---")    
-    simulation_system = copy.deepcopy(original_system)
-    execution_log, response_times = run_simulation(simulation_system)
-
-    print("\n--- Exporting results ---")
-    export_solution_csv(simulation_system, response_times, filename=args.output)
+    try:
+        run_case(input_dir, args.output, exact=args.exact_interface, jobs=args.jobs,
+                 cache_file=args.cache, cache_size=args.cache_size, trace_file=args.trace, columnar_file=args.npz,
+                 profile_file=args.profile, cprofile_file=args.cprofile, rta=args.rta, simulate=not args.no_simulation,
+                 horizon=horizon, monte_carlo=monte_carlo, input_cache=args.input_cache, allocate=args.allocate,
+                 local_search=args.local_search, allocation_file=args.allocation_output, speed_aware=args.speed_aware)
+    except SystemValidationError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
 
     print(f"\n[INFO] Log saved to: {log_path}")
 
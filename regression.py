@@ -0,0 +1,220 @@
+import argparse, contextlib, io, os, sys, tempfile
+from collections import defaultdict, deque
+
+import numpy as np
+
+import main
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+TEST_CASE_DIR = os.path.join(REPO_DIR, "Test_Case_Generator")
+BUNDLED_CASES = [
+    "1-tiny-test-case", "2-small-test-case", "3-medium-test-case", "4-large-test-case",
+    "5-huge-test-case", "6-gigantic-test-case", "7-unschedulable-test-case", "8-unschedulable-test-case",
+    "9-unschedulable-test-case", "10-unschedulable-test-case", os.path.join(REPO_DIR, "input"),
+]
+CHECKS = ["interface", "simulation", "horizon", "allocation"]
+
+
+def _load(input_dir):
+    return main.load_system_model_from_csv(*main._input_files(input_dir))
+
+
+def _silently(func, *args, **kwargs):
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        result = func(*args, **kwargs)
+    return result, buf.getvalue()
+
+
+def _report(output):
+    # The part of a simulation log that holds the results, without the horizon and trace notes above it
+    start = output.find("\n--- SIMULATION RESULTS ---")
+    return output[start:] if start >= 0 else output
+
+
+def grid_bdr_params(tasks, scheduling, max_time=100):
+    """The original scalar search: the first delta, then the first alpha of the grid, whose sbf covers dbf."""
+    if scheduling == "EDF":
+        dbf = [main.dbf_edf(tasks, t) for t in range(1, max_time + 1)]
+    else:
+        dbf = [max((main.dbf_fps(tasks, t, τ) for τ in tasks), default=0) for t in range(1, max_time + 1)]
+    for delta in range(1, max_time + 1):
+        for alpha in np.linspace(0.01, 1.0, 200):
+            if all(main.sbf_bdr(alpha, delta, t) >= dbf[t - 1] for t in range(1, max_time + 1)):
+                return round(alpha, 3), delta
+    return None, None
+
+
+def tick_simulation(system, sim_time):
+    """The original tick-by-tick simulator: (response times, trace segments, busy ticks per component)."""
+    supply = {}
+    for comp in system["components"].values():
+        try:
+            Csupply, Tsupply = main.half_half_transform(comp.bdr_alpha, comp.bdr_delta)
+        except ValueError:
+            continue
+        supply[comp.name] = {"Csupply": Csupply, "Tsupply": Tsupply, "budget_left": Csupply, "last_replenish": 0}
+
+    response_times = defaultdict(list)
+    released = defaultdict(deque)
+    remaining = {}
+    busy_time = {name: 0 for name in supply}
+    segments = {name: [] for name in system["cores"]}
+    for time in range(sim_time):
+        for core in system["cores"].values():
+            selected = None
+            for comp in core.components:
+                if comp.name not in supply:
+                    continue
+                state = supply[comp.name]
+                if time - state["last_replenish"] >= state["Tsupply"]:
+                    state["budget_left"] = state["Csupply"]
+                    state["last_replenish"] = time
+                if time < comp.bdr_delta or state["budget_left"] <= 0:
+                    continue
+                # Every component registers its releases, the first one with work gets the tick
+                active = []
+                for task in comp.tasks:
+                    if time % task.period == 0:
+                        released[task.name].append(time)
+                        remaining[task.name] = task.wcet
+                    if remaining.get(task.name, 0) > 0:
+                        active.append(task)
+                if active and selected is None:
+                    if comp.scheduling == "FPS":
+                        active.sort(key=lambda x: x.priority)
+                    elif comp.scheduling == "EDF":
+                        active.sort(key=lambda x: time + x.deadline - (time % x.period))
+                    selected = (comp, active[0])
+            if selected is None:
+                continue
+
+            comp, task = selected
+            remaining[task.name] -= 1.0 / core.speed
+            supply[comp.name]["budget_left"] -= 1.0
+            busy_time[comp.name] += 1
+            runs = segments[core.name]
+            if runs and runs[-1][2] == time and runs[-1][0] == task.name:
+                runs[-1][2] = time + 1
+            else:
+                runs.append([task.name, time, time + 1])
+            if remaining[task.name] <= 0:
+                response_times[task.name].append(time - released[task.name].popleft() + 1)
+                del remaining[task.name]
+
+    trace = [(core, start, end, task) for core, runs in segments.items() for task, start, end in runs]
+    return response_times, trace, busy_time
+
+
+def check_interfaces(system):
+    """Returns the components whose vectorized grid search differs from the scalar one."""
+    return [comp.name for comp in system["components"].values()
+            if main.find_min_bdr_params(comp.tasks, comp.scheduling) != grid_bdr_params(comp.tasks, comp.scheduling)]
+
+
+def check_simulation(system, sim_time, tmp):
+    """Compares the event-driven simulator with the tick engine; returns the differing outputs."""
+    trace_file = os.path.join(tmp, "events.bin")
+    (_, response_times), output = _silently(main.run_simulation, system, max_time=sim_time, trace_file=trace_file)
+    expected_rts, expected_trace, busy_time = tick_simulation(system, sim_time)
+    supply_info, _ = _silently(main._component_supply_info, system)
+    _, expected_report = _silently(main._print_simulation_report, system, expected_rts, busy_time, supply_info,
+                                   {name: sim_time for name in supply_info})
+
+    failures = []
+    if {k: v for k, v in response_times.items() if v} != {k: v for k, v in expected_rts.items() if v}:
+        failures.append("response times")
+    if list(main.read_trace(trace_file)) != expected_trace:
+        failures.append("trace")
+    if _report(output) != _report(expected_report):
+        failures.append("report")
+    return failures
+
+
+def check_horizons(system, sim_time, tmp):
+    """Compares the repeat horizon and the per-core worker processes with a plain serial run."""
+    runs = {}
+    for name, kwargs in [("serial", {}), ("repeat", {"horizon": main.HorizonPolicy("repeat")}), ("jobs", {"jobs": 2})]:
+        trace_file = os.path.join(tmp, f"{name}.bin")
+        (_, response_times), output = _silently(main.run_simulation, system, max_time=sim_time,
+                                                trace_file=trace_file, **kwargs)
+        with open(trace_file, "rb") as f:
+            runs[name] = (dict(response_times), f.read(), _report(output))
+
+    failures = []
+    for name in ("repeat", "jobs"):
+        for label, current, expected in zip(("response times", "trace", "report"), runs[name], runs["serial"]):
+            if current != expected:
+                failures.append(f"{name} {label}")
+    return failures
+
+
+def check_allocation(input_dir, tmp):
+    """Re-loads the budgets.csv each allocation writes and runs Theorem 1 on it; returns the disagreeing runs."""
+    tasks_file, arch_file, budgets_file = main._input_files(input_dir)
+    demand = main.SpeedScaledDemand()
+    failures = []
+    for strategy in main.ALLOCATION_STRATEGIES:
+        for local_search in (False, True):
+            output_file = os.path.join(tmp, "budgets_allocated.csv")
+            (_, verdicts), _ = _silently(main.run_allocation, _load(input_dir), budgets_file, output_file,
+                                         strategy, local_search)
+            written = main.load_system_model_from_csv(tasks_file, arch_file, output_file)
+            expected = {}
+            for core in written["cores"].values():
+                child_bdrs = [main._component_interface((demand.tasks(comp.tasks, core.speed), comp.scheduling, False))
+                              for comp in core.components]
+                expected[core.name] = (all(alpha is not None for alpha, _ in child_bdrs)
+                                       and bool(main.validate_theorem1(child_bdrs)[0]))
+            if verdicts != expected:
+                failures.append(f"{strategy}{' + local search' if local_search else ''}")
+    return failures
+
+
+def run_checks(input_dir, checks, max_time=None):
+    system = _load(input_dir)
+    sim_time = int(main.lcm([task.period for task in system["tasks"].values()])) if max_time is None else max_time
+    failures = []
+    if "interface" in checks:
+        failures += [f"interface of {name}" for name in check_interfaces(system)]
+    # Both the budgets.csv supply and the analysed interfaces are simulated
+    supplies = [("budgets.csv", system)]
+    if {"simulation", "horizon"} & set(checks):
+        analysed = _load(input_dir)
+        _silently(main.run_analysis, analysed)
+        supplies.append(("analysis", analysed))
+    with tempfile.TemporaryDirectory() as tmp:
+        for supply, simulated in supplies:
+            if "simulation" in checks:
+                failures += [f"{supply} simulation {name}" for name in check_simulation(simulated, sim_time, tmp)]
+            if "horizon" in checks:
+                failures += [f"{supply} {name}" for name in check_horizons(simulated, sim_time, tmp)]
+        if "allocation" in checks:
+            failures += [f"allocation {name}" for name in check_allocation(input_dir, tmp)]
+    return failures
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Check the optimized analysis and simulation against their reference implementations")
+    parser.add_argument('--cases', nargs='*', default=BUNDLED_CASES, help="Bundled case names or input directories to check")
+    parser.add_argument('--checks', nargs='*', choices=CHECKS, default=CHECKS, help="Checks to run")
+    parser.add_argument('--max-time', type=int, default=None, help="Simulate this many ticks instead of the hyperperiod")
+    args = parser.parse_args()
+
+    failed = False
+    for case in args.cases:
+        input_dir = case if os.path.isdir(case) else os.path.join(TEST_CASE_DIR, case)
+        name = os.path.basename(os.path.normpath(input_dir))
+        print(f"[CHECK] {name}", file=sys.stderr)
+        failures = run_checks(input_dir, args.checks, args.max_time)
+        if failures:
+            failed = True
+            print(f"✗ {name}: {', '.join(failures)} differ")
+        else:
+            print(f"✓ {name}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main_cli()